@@ -0,0 +1,174 @@
+"""Time every ranking stage against recorded fixtures, for 1, 5 and 15 game slates.
+
+Stages: load_csvs (cold), lineups (schedule + boxscores through the
+StatsAPI client), player_ids (the lookup_player_id fallback over every
+name on the slate, fresh ID cache), joins (season / matchup / wind features), recent_form (11-Day
+aggregation), weather (page parse) and scoring. Each stage reports the
+median wall time, peak traced allocation and throughput, and is compared
+against benchmarks/baseline.json.
+
+Nothing touches the network: StatsAPI is replayed from the fixture set,
+pybaseball lookups answer "no match", and fixtures are synthesized from
+the reference CSVs when none have been recorded.
+
+Usage: python3 benchmarks/bench.py [--games 1,5,15] [--repeat 5] [--fixtures DIR]
+                                   [--record] [--save-baseline] [--check]
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import fixtures  # puts the repo root on sys.path
+
+import data_store
+import features
+import player_ids
+from recent_form import aggregate_recent_form
+from scrape_stats import load_csvs
+from slate import fetch_slate_lineups, slate_batters, rank_batters
+import weather
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+SLATE_SIZES = (1, 5, 15)
+STATS = ["EV", "Barrel %", "xSLG", "Opp xwOBA", "Wind Carry"]
+WEIGHTS = [0.3, 0.3, 0.2, 0.1, 0.1]
+REGRESSION = 1.5     # flag stages this many times slower than baseline...
+MIN_DELTA_MS = 2.0   # ...and at least this much slower in absolute terms
+
+
+def measure(fn, repeat, setup=None):
+    """Median wall time over `repeat` runs, plus peak traced allocation of one extra run."""
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    if setup is not None:
+        setup()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, statistics.median(times), peak
+
+def _no_pybaseball(last, first):
+    return None
+
+def run_slate(directory, games, repeat):
+    """{stage: (seconds, peak bytes, items)} for one slate size."""
+    results = {}
+    pitches = fixtures.load_statcast(directory)
+    html = fixtures.load_weather_html(directory)
+
+    def cold_load():
+        tables = load_csvs()
+        data_store.handedness_map()
+        data_store.bats_throws()
+        features.batters()
+        features.pitchers()
+        return sum(len(t) for t in tables)
+
+    def clear():
+        data_store.clear()
+        features.clear()
+
+    rows, seconds, peak = measure(cold_load, repeat, setup=clear)
+    results["load_csvs"] = (seconds, peak, rows)
+
+    with fixtures.replay(directory, games) as client:
+        lineups, seconds, peak = measure(fetch_slate_lineups, repeat, setup=lambda: client._memory.clear())
+    results["lineups"] = (seconds, peak, len(lineups))
+
+    names = list(dict.fromkeys(b.name for _, lineup in lineups for b in lineup.batters))
+    saved_cache, saved_lookup = player_ids._id_cache, player_ids.playerid_lookup
+    with tempfile.TemporaryDirectory() as tmp, fixtures.replay(directory, games):
+        counter = iter(range(repeat + 1))
+
+        def fresh_cache():
+            player_ids._id_cache = player_ids.IdCache(Path(tmp) / f"ids_{next(counter)}.sqlite")
+
+        player_ids.playerid_lookup = _no_pybaseball
+        try:
+            ids, seconds, peak = measure(lambda: player_ids.lookup_player_ids(names), repeat, setup=fresh_cache)
+        finally:
+            player_ids._id_cache, player_ids.playerid_lookup = saved_cache, saved_lookup
+    results["player_ids"] = (seconds, peak, len(names))
+
+    table, seconds, peak = measure(lambda: weather.parse_weather(html), repeat)
+    results["weather"] = (seconds, peak, len(table))
+    weather._cache["table"] = (time.time(), table)
+
+    joined, seconds, peak = measure(lambda: slate_batters(lineups), repeat)
+    results["joins"] = (seconds, peak, len(joined))
+
+    slate_pitches = pitches[pitches["batter"].isin([pid for pid in ids.values() if pid is not None])]
+    as_of = slate_pitches["game_date"].max() if not slate_pitches.empty else None
+    form, seconds, peak = measure(lambda: aggregate_recent_form(slate_pitches, as_of=as_of), repeat)
+    results["recent_form"] = (seconds, peak, len(slate_pitches))
+
+    ranked, seconds, peak = measure(lambda: rank_batters(joined, STATS, WEIGHTS), repeat)
+    results["scoring"] = (seconds, peak, len(joined))
+    return results
+
+def report(all_results, baseline):
+    """Print one table per slate size; returns the list of regressed stage keys."""
+    regressions = []
+    for games, results in all_results.items():
+        print(f"\n{games} game(s)")
+        print(f"  {'stage':<12} {'wall ms':>9} {'peak KiB':>9} {'items/s':>11} {'baseline':>9}")
+        for stage, (seconds, peak, items) in results.items():
+            key = f"{stage}@{games}"
+            ms = seconds * 1000
+            base = baseline.get(key, {}).get("wall_ms")
+            note = ""
+            if base is not None:
+                note = f"{ms / base:8.2f}x" if base > 0 else ""
+                if ms > base * REGRESSION and ms - base > MIN_DELTA_MS:
+                    regressions.append(key)
+                    note += "  REGRESSION"
+            rate = items / seconds if seconds > 0 else float("inf")
+            print(f"  {stage:<12} {ms:9.2f} {peak / 1024:9.0f} {rate:11.0f} {note}")
+    return regressions
+
+def to_baseline(all_results):
+    return {
+        f"{stage}@{games}": {"wall_ms": round(seconds * 1000, 3), "peak_bytes": peak, "items": items}
+        for games, results in all_results.items()
+        for stage, (seconds, peak, items) in results.items()
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark every ranking stage against recorded fixtures.")
+    parser.add_argument("--games", default=",".join(str(n) for n in SLATE_SIZES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--fixtures", default=str(fixtures.FIXTURE_DIR))
+    parser.add_argument("--record", action="store_true", help="capture today's live slate into --fixtures first")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--check", action="store_true", help="exit 1 if any stage regressed")
+    args = parser.parse_args()
+
+    directory = fixtures.record(args.fixtures) if args.record else fixtures.ensure(args.fixtures)
+    all_results = {int(n): run_slate(directory, int(n), args.repeat) for n in args.games.split(",")}
+    baseline = json.loads(BASELINE_PATH.read_text()).get("stages", {}) if BASELINE_PATH.exists() else {}
+    regressions = report(all_results, {} if args.save_baseline else baseline)
+
+    if args.save_baseline:
+        BASELINE_PATH.write_text(json.dumps({
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "stages": to_baseline(all_results),
+        }, indent=2) + "\n")
+        print(f"\nBaseline written to {BASELINE_PATH}")
+    elif regressions:
+        print(f"\nRegressed vs baseline: {', '.join(regressions)}")
+        if args.check:
+            sys.exit(1)
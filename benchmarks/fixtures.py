@@ -0,0 +1,247 @@
+"""Recorded inputs for the benchmark harness, and replay plumbing.
+
+A fixture set is a directory holding:
+
+    schedule.json          StatsAPI /schedule response
+    boxscore_<gamePk>.json StatsAPI /game/<gamePk>/boxscore responses
+    statcast.parquet       pitch-level Statcast frame covering the slate's batters
+    weather.html           RotoGrinders weather page
+
+`record()` captures a live slate; `synthesize()` builds a deterministic
+15-game slate from the reference CSVs so the harness also runs offline.
+Fixture sets stay local (they are scraped third-party data).
+"""
+import json
+import sys
+import tempfile
+from contextlib import contextmanager
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+FIXTURE_DIR = Path(__file__).resolve().parent / "fixtures"
+STATCAST_DAYS = 30
+SEED = 20250601
+
+
+# --- replay ---
+
+class _Response:
+    def __init__(self, body):
+        self.status_code = 200 if body is not None else 404
+        self.headers = {}
+        self.content = json.dumps(body).encode() if body is not None else b""
+        self._body = body
+
+    def json(self):
+        return self._body
+
+    def raise_for_status(self):
+        if self._body is None:
+            import requests
+            raise requests.HTTPError(f"no fixture ({self.status_code})")
+
+
+class FixtureSession:
+    """Stands in for the StatsApiClient's requests.Session, answering from a fixture set.
+
+    `games` limits the schedule to its first N games, for slate-size runs.
+    People searches answer with no match.
+    """
+
+    def __init__(self, directory, games=None):
+        self.directory = Path(directory)
+        self.games = games
+        self.requests = 0
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.requests += 1
+        path = url.split("/api/v1", 1)[-1] if "/api/v1" in url else "/" + url.split("/", 3)[-1]
+        if path.endswith("/schedule"):
+            schedule = json.loads((self.directory / "schedule.json").read_text())
+            if self.games is not None:
+                for day in schedule.get("dates", []):
+                    day["games"] = day["games"][:self.games]
+            return _Response(schedule)
+        if path.endswith("/boxscore"):
+            game_pk = path.rstrip("/").split("/")[-2]
+            box = self.directory / f"boxscore_{game_pk}.json"
+            return _Response(json.loads(box.read_text()) if box.exists() else None)
+        if path.endswith("/people/search"):
+            return _Response({"people": []})
+        return _Response(None)
+
+
+@contextmanager
+def replay(directory, games=None):
+    """Point the shared StatsAPI client at a fixture set (no disk cache) for the duration."""
+    from statsapi import client
+    saved = client.session, client.cache_dir, client._memory
+    client.session, client.cache_dir, client._memory = FixtureSession(directory, games), None, {}
+    try:
+        yield client
+    finally:
+        client.session, client.cache_dir, client._memory = saved
+
+@contextmanager
+def statcast_store_from(directory):
+    """Point statcast_store at a temp store filled from the fixture pitches, as a nightly pull would leave it."""
+    import statcast_store
+    pitches = load_statcast(directory)
+    saved = statcast_store.STORE_DIR
+    with tempfile.TemporaryDirectory() as tmp:
+        statcast_store.STORE_DIR = Path(tmp) / "statcast_store"
+        try:
+            statcast_store.update(fetch=lambda start, end: pitches[
+                pitches["game_date"].astype(str).str[:10].between(start, end)])
+            yield statcast_store.STORE_DIR
+        finally:
+            statcast_store.STORE_DIR = saved
+
+def load_statcast(directory):
+    return pd.read_parquet(Path(directory) / "statcast.parquet")
+
+def load_weather_html(directory):
+    return (Path(directory) / "weather.html").read_text()
+
+
+# --- recording ---
+
+def record(directory=FIXTURE_DIR, day=None):
+    """Capture today's (or `day`'s) schedule, boxscores, weather page and recent Statcast."""
+    import requests
+    import statsapi
+    import weather
+    from get_lineups import todays_games
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    client = statsapi.StatsApiClient(cache_dir=None)
+    schedule = client.schedule(day)
+    (directory / "schedule.json").write_text(json.dumps(schedule))
+    for game in todays_games(schedule):
+        box = client.boxscore(game["gamePk"])
+        (directory / f"boxscore_{game['gamePk']}.json").write_text(json.dumps(box))
+
+    response = requests.get(weather.WEATHER_URL, headers={"User-Agent": "Mozilla/5.0"}, timeout=weather.TIMEOUT)
+    response.raise_for_status()
+    (directory / "weather.html").write_text(response.text)
+
+    from pybaseball import statcast
+    end = date.fromisoformat(day) if day else date.today()
+    pitches = statcast((end - timedelta(days=STATCAST_DAYS)).isoformat(), (end - timedelta(days=1)).isoformat(),
+                       verbose=False)
+    pitches.to_parquet(directory / "statcast.parquet", index=False)
+    return directory
+
+
+# --- synthetic fixtures ---
+
+def _team_names():
+    from get_lineups import TEAM_NAME_MAP
+    return list(TEAM_NAME_MAP.values())
+
+def _savant_names(table):
+    import data_store
+    df = data_store.read_csv(table)
+    last_first = df["last_name, first_name"].str.split(", ", n=1)
+    names = last_first.str[1] + " " + last_first.str[0]
+    return list(zip(names, df["player_id"].astype(int)))
+
+def _weather_html(rng):
+    import weather
+    blocks = []
+    for team, stadium in weather.STADIUM_KEYWORDS.items():
+        if team in ("TBR", "TEX", "MIA", "TOR", "HOU", "ARI", "MIL", "SEA"):
+            blocks.append(f'<div class="module"><span class="game-weather-stadium">@ {stadium.title()}</span></div>')
+            continue
+        temp, precip = rng.integers(55, 95), rng.integers(0, 60)
+        speed, angle = rng.integers(0, 20), rng.uniform(0, 360)
+        value = '<span><span class="weather-gametime-value bold">{}</span></span>'
+        blocks.append(
+            '<div class="module">'
+            f'<span class="game-weather-stadium">@ {stadium.title()}</span>'
+            '<div class="weather-gametime-set"><span>Game Time</span>'
+            f'{value.format(f"{temp}°")}{value.format(f"{precip}%")}</div>'
+            '<div class="weather-gametime-set"><span>Wind</span>'
+            f'{value.format("Out to CF")}{value.format(speed)}</div>'
+            '<span class="weather-gametime-icon"><svg><path d="M0"/><path d="M1"/>'
+            f'<path style="fill:#000; transform: rotate({angle:.1f}deg);" d="M2"/></svg></span>'
+            '</div>'
+        )
+    # surrounding markup the SoupStrainer has to skip
+    filler = '<div class="nav"><ul>' + "<li><a href='#'>link</a></li>" * 200 + "</ul></div>"
+    return f"<html><head><title>MLB Weather</title></head><body>{filler}{''.join(blocks)}</body></html>"
+
+def _statcast_frame(batters, rng, end):
+    rows = []
+    for player_id in batters:
+        days = rng.integers(12, STATCAST_DAYS)
+        for offset in rng.choice(STATCAST_DAYS, size=days, replace=False):
+            pitches = rng.integers(10, 22)
+            rows.append((end - timedelta(days=int(offset) + 1), player_id, pitches))
+    game_dates, batter_ids, counts = map(np.array, zip(*rows))
+    n = counts.sum()
+    in_play = rng.random(n) < 0.18
+    return pd.DataFrame({
+        "game_date": pd.to_datetime(np.repeat(game_dates, counts)),
+        "batter": np.repeat(batter_ids, counts),
+        "pitcher": rng.integers(600000, 700000, n),
+        "type": np.where(in_play, "X", rng.choice(["B", "S"], n)),
+        "launch_speed": np.where(in_play, rng.normal(89, 14, n).clip(30, 120), np.nan),
+        "launch_angle": np.where(in_play, rng.normal(12, 26, n).clip(-80, 85), np.nan),
+    })
+
+def synthesize(directory=FIXTURE_DIR, games=15, seed=SEED):
+    """Write a deterministic `games`-game fixture set built from the reference CSVs."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    teams = _team_names()
+    batters = _savant_names("exit_batters")
+    pitchers = _savant_names("exit_pitchers")
+    order = rng.permutation(len(batters))
+
+    schedule_games = []
+    slate_ids = []
+    for i in range(games):
+        game_pk = 800000 + i
+        schedule_games.append({
+            "gamePk": game_pk,
+            "status": {"abstractGameState": "Preview"},
+            "teams": {
+                side: {"team": {"name": teams[2 * i + k]},
+                       "probablePitcher": {"id": pitchers[2 * i + k][1], "fullName": pitchers[2 * i + k][0]}}
+                for k, side in enumerate(("away", "home"))
+            },
+        })
+        box = {"teams": {}}
+        for side_index, side in enumerate(("away", "home")):
+            players = {}
+            for slot in range(9):
+                name, player_id = batters[order[(i * 2 + side_index) * 9 + slot]]
+                players[f"ID{player_id}"] = {"person": {"id": player_id, "fullName": name},
+                                             "battingOrder": str((slot + 1) * 100)}
+                slate_ids.append(player_id)
+            box["teams"][side] = {"players": players}
+        (directory / f"boxscore_{game_pk}.json").write_text(json.dumps(box))
+
+    end = date(2025, 6, 1)
+    (directory / "schedule.json").write_text(json.dumps({"dates": [{"date": end.isoformat(),
+                                                                       "games": schedule_games}]}))
+    _statcast_frame(slate_ids, rng, end).to_parquet(directory / "statcast.parquet", index=False)
+    (directory / "weather.html").write_text(_weather_html(rng))
+    return directory
+
+def ensure(directory=FIXTURE_DIR):
+    """The fixture set at `directory`, synthesizing one if nothing has been recorded there."""
+    directory = Path(directory)
+    if not (directory / "schedule.json").exists():
+        synthesize(directory)
+    return directory
@@ -0,0 +1,126 @@
+"""Cold-start and rerun latency of the Streamlit app.
+
+import_pipeline: `python -X importtime -c "import pipeline"` in a fresh
+interpreter (everything app.py imports besides streamlit), summed over
+top-level imports. The heaviest modules are listed, and the run fails if
+a library that should load on first use (DEFERRED) is imported eagerly.
+
+app_first_run / app_rerun: streamlit's AppTest running app.py in a fresh
+process against the fixture slate. That is the first script run (schedule
+read, widgets, warm-up thread started) followed by a plain rerun, the
+cost paid on every widget interaction. The Statcast store is filled from
+the fixture pitches first, as the nightly `python statcast_store.py`
+would leave it, so no run starts a live pull.
+
+Results are compared against benchmarks/startup_baseline.json.
+
+Usage: python3 benchmarks/startup.py [--repeat 5] [--top 15] [--fixtures DIR] [--save-baseline] [--check]
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import fixtures  # puts the repo root on sys.path
+
+from bench import REGRESSION, MIN_DELTA_MS
+
+BASELINE_PATH = Path(__file__).resolve().parent / "startup_baseline.json"
+DEFERRED = ("pybaseball", "bs4", "PIL", "matplotlib")
+
+
+def import_profile(module="pipeline"):
+    """(total seconds, {module: cumulative seconds}) from one -X importtime run in a fresh interpreter."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=fixtures.ROOT, capture_output=True, text=True, check=True)
+    total, modules = 0, {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line or "self [us]" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        modules[name.strip()] = int(cumulative) / 1e6
+        if not name[1:].startswith(" "):  # top-level import (nested ones are indented)
+            total += int(cumulative)
+    return total / 1e6, modules
+
+def app_timings(directory):
+    """{"app_first_run": s, "app_rerun": s} measured in a fresh interpreter."""
+    result = subprocess.run([sys.executable, __file__, "--child", str(directory)],
+                            cwd=fixtures.ROOT, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def _child(directory):
+    from streamlit.testing.v1 import AppTest
+    import weather
+
+    weather._cache["table"] = (time.time(), weather.parse_weather(fixtures.load_weather_html(directory)))
+    with fixtures.replay(directory), fixtures.statcast_store_from(directory):
+        app = AppTest.from_file(str(fixtures.ROOT / "app.py"), default_timeout=60)
+        start = time.perf_counter()
+        app.run()
+        first = time.perf_counter() - start
+        start = time.perf_counter()
+        app.run()
+        rerun = time.perf_counter() - start
+    if app.exception:
+        raise SystemExit(f"app raised: {app.exception}")
+    print(json.dumps({"app_first_run": first, "app_rerun": rerun}))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--child":
+        _child(Path(sys.argv[2]))
+        sys.exit(0)
+
+    parser = argparse.ArgumentParser(description="Profile app import time and rerun latency.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="heaviest modules to list")
+    parser.add_argument("--fixtures", default=str(fixtures.FIXTURE_DIR))
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--check", action="store_true", help="exit 1 on a regression or an eager deferred import")
+    args = parser.parse_args()
+    directory = fixtures.ensure(args.fixtures)
+
+    profiles = [import_profile() for _ in range(args.repeat)]
+    apps = [app_timings(directory) for _ in range(args.repeat)]
+    results = {"import_pipeline": statistics.median(total for total, _ in profiles)}
+    for stage in ("app_first_run", "app_rerun"):
+        results[stage] = statistics.median(run[stage] for run in apps)
+
+    modules = profiles[-1][1]
+    print("Heaviest imports under pipeline (cumulative ms):")
+    for name, seconds in sorted(modules.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {name:<40} {seconds * 1000:8.1f}")
+    eager = sorted({name.split(".")[0] for name in modules} & set(DEFERRED))
+    if eager:
+        print(f"\nImported eagerly (should load on first use): {', '.join(eager)}")
+
+    baseline = json.loads(BASELINE_PATH.read_text()).get("stages", {}) if BASELINE_PATH.exists() else {}
+    regressions = []
+    print(f"\n  {'stage':<16} {'wall ms':>9} {'baseline':>9}")
+    for stage, seconds in results.items():
+        ms = seconds * 1000
+        base = None if args.save_baseline else baseline.get(stage, {}).get("wall_ms")
+        note = ""
+        if base:
+            note = f"{ms / base:8.2f}x"
+            if ms > base * REGRESSION and ms - base > MIN_DELTA_MS:
+                regressions.append(stage)
+                note += "  REGRESSION"
+        print(f"  {stage:<16} {ms:9.1f} {note}")
+
+    if args.save_baseline:
+        BASELINE_PATH.write_text(json.dumps({
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "stages": {stage: {"wall_ms": round(seconds * 1000, 3)} for stage, seconds in results.items()},
+        }, indent=2) + "\n")
+        print(f"\nBaseline written to {BASELINE_PATH}")
+    elif regressions:
+        print(f"\nRegressed vs baseline: {', '.join(regressions)}")
+    if args.check and (regressions or eager):
+        sys.exit(1)
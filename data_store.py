@@ -0,0 +1,251 @@
+"""Process-wide cache for the reference CSVs.
+
+Every table is parsed once per process and re-read only when its file's
+mtime or size changes, so concurrent Streamlit sessions share one copy.
+When `python compile_data.py` has been run, tables load from a typed
+Arrow snapshot instead of re-parsing the CSVs. Snapshots are published
+as versions: each compile writes a new data_snapshot/<version>/
+directory and then atomically swaps the CURRENT stamp. Every worker
+process maps the current version read-only, with numbers and strings
+left in the shared page cache rather than copied per process. A worker
+notices a new stamp on its next table access and remaps without
+restarting.
+Callers get shallow copies of the shared frames and must treat them as
+read-only. Adding or replacing columns is safe either way; in-place
+edits (`.loc[...] = `, `fillna(inplace=True)`) write through to the
+cache unless the process enables pandas copy-on-write, as app.py and
+server.py do. Mapped snapshot tables are read-only buffers and raise on
+such edits regardless.
+"""
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from instrumentation import timed
+
+DATA_DIR = Path(__file__).resolve().parent
+
+
+def clean_name(name):
+    return re.sub(r"[^\w\s]", "", name).lower().strip()
+
+def _key_savant(df):
+    df["name_key"] = df["last_name, first_name"].map(clean_name)
+    return df
+
+def _type_id_map(df):
+    df["MLBID"] = df["MLBID"].astype("Int64")
+    return df
+
+def _key_batted_ball(df):
+    df["name_clean"] = df["name"].map(clean_name)
+    df["name_key"] = df["name_clean"]
+    df["player_id"] = df["id"]
+    return df
+
+_SAVANT_EXIT = ["last_name, first_name", "player_id", "attempts", "avg_hit_speed", "ev95percent", "brl_percent"]
+_SAVANT_EXPECTED = ["last_name, first_name", "player_id", "pa", "est_ba", "est_slg", "est_woba"]
+
+# table name -> (file name, columns the tool uses or None for all, post-load hook run once per (re)load)
+TABLES = {
+    "expected_batters": ("expected_batters.csv", _SAVANT_EXPECTED, _key_savant),
+    "exit_batters": ("exit_batters.csv", _SAVANT_EXIT, _key_savant),
+    "expected_pitchers": ("expected_pitchers.csv", _SAVANT_EXPECTED, _key_savant),
+    "exit_pitchers": ("exit_pitchers.csv", _SAVANT_EXIT, _key_savant),
+    "batted_ball": ("batted_ball.csv", ["id", "name", "bbe", "fb_rate", "pull_air_rate", "oppo_air_rate"],
+                    _key_batted_ball),
+    "handedness": ("handedness.csv", None, None),
+    "player_id_map": ("player_id_map.csv", ["PLAYERNAME", "FIRSTNAME", "LASTNAME", "TEAM", "MLBID", "MLBNAME",
+                                            "FANGRAPHSNAME", "BATS", "THROWS", "ACTIVE"], _type_id_map),
+}
+
+# Compiled Arrow IPC snapshot written by `python compile_data.py`
+SNAPSHOT_DIR = DATA_DIR / "data_snapshot"
+CURRENT_PATH = SNAPSHOT_DIR / "CURRENT"  # {"version": ..., "tables": {name: [csv mtime_ns, size]}}
+KEEP_VERSIONS = 2  # the current version plus the one workers may still have mapped
+
+_lock = threading.Lock()
+_tables = {}   # name -> (signature, frame)
+_derived = {}  # (name, builder key) -> (signature, value)
+_current = [None, {}]  # [CURRENT file signature, parsed stamp]
+
+
+def _signature(path):
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+def current_version():
+    """The published snapshot stamp, re-read only when the CURRENT file changes ({} if none)."""
+    try:
+        sig = _signature(CURRENT_PATH)
+    except OSError:
+        return {}
+    with _lock:
+        if _current[0] == sig:
+            return _current[1]
+    try:
+        stamp = json.loads(CURRENT_PATH.read_text())
+    except (OSError, ValueError):
+        return {}
+    with _lock:
+        _current[:] = [sig, stamp]
+    return stamp
+
+def snapshot_path(name, version=None):
+    version = version or current_version().get("version")
+    return SNAPSHOT_DIR / str(version) / f"{name}.arrow"
+
+def read_csv(name):
+    """Parse a table from its CSV, keeping only the used columns and applying its hook."""
+    file_name, columns, hook = TABLES[name]
+    df = pd.read_csv(DATA_DIR / file_name, usecols=columns)
+    return hook(df) if hook is not None else df
+
+def map_arrow(path):
+    """Memory-map an Arrow IPC file read-only as a DataFrame.
+
+    Null-free numeric columns are zero-copy views and strings stay
+    Arrow-backed, so the data lives in the OS page cache that every
+    process mapping the same file shares.
+    """
+    import pyarrow as pa
+
+    with pa.memory_map(str(path), "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+    strings = {pa.string(): pd.StringDtype("pyarrow"), pa.large_string(): pd.StringDtype("pyarrow")}
+    return table.to_pandas(split_blocks=True, types_mapper=strings.get)
+
+def write_arrow(path, frame, preserve_index=False):
+    """Write a DataFrame to an Arrow IPC file via a temp file and os.replace."""
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(frame, preserve_index=preserve_index)
+    tmp = Path(path).with_suffix(f".{os.getpid()}.tmp")
+    with pa.OSFile(str(tmp), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp, path)
+
+def read_snapshot(name):
+    """Map a table from the current snapshot version."""
+    return map_arrow(snapshot_path(name))
+
+def _load(name):
+    """Return (signature, frame) for a table, re-reading only if its CSV or the published version changed."""
+    csv_sig = _signature(DATA_DIR / TABLES[name][0])
+    stamp = current_version()
+    published = stamp.get("tables", {}).get(name) == list(csv_sig)
+    sig = (csv_sig, stamp.get("version") if published else None)
+    with _lock:
+        entry = _tables.get(name)
+        if entry is not None and entry[0] == sig:
+            return entry
+    source = "snapshot" if published else "csv"
+    with timed("table_load", table=name, source=source):
+        df = map_arrow(snapshot_path(name, sig[1])) if published else read_csv(name)
+    with _lock:
+        _tables[name] = (sig, df)
+    return sig, df
+
+def compile_snapshot(names=None):
+    """Publish a new snapshot version with every table (or just `names`) recompiled from its CSV.
+
+    Tables not being recompiled are carried over from the current version
+    by hard link. Workers switch when CURRENT is swapped; a table whose CSV
+    has changed since it was compiled is parsed from the CSV instead.
+    Returns the new version stamp.
+    """
+    previous = current_version()
+    carried = previous.get("tables", {})
+    version = str(time.time_ns())
+    target = SNAPSHOT_DIR / version
+    target.mkdir(parents=True)
+    tables = {}
+    for name in TABLES:
+        old = snapshot_path(name, previous.get("version")) if name in carried else None
+        if names is not None and name not in names and old is not None and old.exists():
+            try:
+                os.link(old, target / old.name)
+            except OSError:
+                shutil.copy2(old, target / old.name)
+            tables[name] = carried[name]
+            continue
+        csv_sig = _signature(DATA_DIR / TABLES[name][0])
+        write_arrow(target / f"{name}.arrow", read_csv(name))
+        tables[name] = list(csv_sig)
+
+    tmp = CURRENT_PATH.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps({"version": version, "tables": tables}, indent=2))
+    os.replace(tmp, CURRENT_PATH)
+    _prune(keep={version, previous.get("version")})
+    return version
+
+def _prune(keep):
+    """Remove old version directories (already-mapped files stay readable until unmapped)."""
+    versions = sorted((p for p in SNAPSHOT_DIR.iterdir() if p.is_dir() and p.name.isdigit()),
+                      key=lambda p: int(p.name), reverse=True)
+    for path in versions[KEEP_VERSIONS:]:
+        if path.name not in keep:
+            shutil.rmtree(path, ignore_errors=True)
+
+def get(name):
+    """Return a read-only view of a reference table."""
+    return _load(name)[1].copy(deep=False)
+
+def source_signature(name):
+    """(mtime_ns, size) of a table's source CSV, without loading it."""
+    return _signature(DATA_DIR / TABLES[name][0])
+
+def cached(name, builder):
+    """Memoize builder(table) until the table's file changes.
+
+    Builders are keyed by module + qualified name, so functions redefined
+    on a Streamlit rerun still hit the cache.
+    """
+    sig, df = _load(name)
+    key = (name, builder.__module__, builder.__qualname__)
+    with _lock:
+        entry = _derived.get(key)
+        if entry is not None and entry[0] == sig:
+            return entry[1]
+    value = builder(df.copy(deep=False))
+    with _lock:
+        _derived[key] = (sig, value)
+    return value
+
+def clear():
+    """Drop every cached table and derived value."""
+    with _lock:
+        _tables.clear()
+        _derived.clear()
+
+
+def _handedness_dict(df):
+    return dict(zip(df["Name"].str.lower().str.strip(), df["Side"]))
+
+def handedness_map():
+    """Lower-cased full name -> batting side ("R", "L" or "S") from handedness.csv."""
+    return cached("handedness", _handedness_dict)
+
+def _bats_throws_frame(df):
+    # active players win name collisions
+    df = df.sort_values("ACTIVE", ascending=False, kind="stable")
+    df = df.assign(name_key=df["PLAYERNAME"].fillna("").map(clean_name)).drop_duplicates("name_key")
+    return df.set_index("name_key")[["MLBID", "BATS", "THROWS"]]
+
+def bats_throws():
+    """MLBID, BATS and THROWS from player_id_map.csv, indexed by clean full name ("first last")."""
+    return cached("player_id_map", _bats_throws_frame)
+
+def _bats_throws_by_id_frame(df):
+    df = df.dropna(subset=["MLBID"]).sort_values("ACTIVE", ascending=False, kind="stable")
+    return df.drop_duplicates("MLBID").set_index("MLBID")[["BATS", "THROWS"]]
+
+def bats_throws_by_id():
+    """BATS and THROWS from player_id_map.csv, indexed by MLBAM id."""
+    return cached("player_id_map", _bats_throws_by_id_frame)
@@ -0,0 +1,164 @@
+"""Materialized per-player season features, keyed by MLBAM id.
+
+The Savant tables, handedness.csv and player_id_map.csv are joined once
+into two wide, typed tables instead of per lineup:
+
+    batters()   MLBID -> Name, BATTER_STATS (Savant defaults filled in),
+                Side, BATS, RightFly, LeftFly
+    pitchers()  MLBID -> Name, PITCHER_STATS, THROWS
+
+A table is rebuilt only when one of its input CSVs changes. Each build is
+written next to the data_store snapshot (`python compile_data.py` does it
+ahead of time, e.g. nightly), so a fresh process maps the table instead
+of joining. Ranking a lineup is then batter_rows() plus scoring's matrix
+product.
+"""
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+import data_store
+from instrumentation import timed
+from scrape_stats import batter_frames, pitcher_frames, batting_sides, hand_column
+
+# table -> input tables; a change to any input's CSV rebuilds it
+INPUTS = {
+    "batters": ("exit_batters", "expected_batters", "batted_ball", "handedness", "player_id_map"),
+    "pitchers": ("exit_pitchers", "expected_pitchers", "player_id_map"),
+}
+MANIFEST_PATH = data_store.SNAPSHOT_DIR / "features.json"
+
+_lock = threading.Lock()
+_built = {}  # table -> (input signature, frame)
+
+
+def _savant_players(*tables):
+    """(MLBAM ids, "First Last" names) of everyone in the given Savant tables, first table's spelling wins."""
+    names = pd.concat([
+        data_store.get(t).set_index("player_id")["last_name, first_name" if t != "batted_ball" else "name"]
+        for t in tables
+    ])
+    names = names[~names.index.duplicated()]
+    last_first = names.str.split(", ", n=1)
+    return names.index.to_list(), (last_first.str[1].fillna("") + " " + last_first.str[0]).str.strip().to_list()
+
+def _batter_features(names, player_ids):
+    exit_batters, expected_batters, batted_ball = (
+        data_store.get(t) for t in ("exit_batters", "expected_batters", "batted_ball"))
+    stats = batter_frames(names, exit_batters, expected_batters, batted_ball, player_ids)
+    stats["Side"] = batting_sides(names, data_store.handedness_map(), player_ids)
+    stats["BATS"] = hand_column("BATS", names, player_ids)
+    stats["RightFly"] = stats["PullAir %"].where(stats["Side"] == "R", stats["OppoAir %"])
+    stats["LeftFly"] = stats["PullAir %"].where(stats["Side"] == "L", stats["OppoAir %"])
+    return stats
+
+def _pitcher_features(names, player_ids):
+    stats = pitcher_frames(names, data_store.get("exit_pitchers"), data_store.get("expected_pitchers"), player_ids)
+    stats["THROWS"] = hand_column("THROWS", names, player_ids)
+    return stats
+
+def _by_mlbid(frame, player_ids):
+    return frame.set_axis(pd.Index(pd.array(player_ids, dtype="Int64"), name="MLBID"))
+
+def build_batters():
+    player_ids, names = _savant_players("exit_batters", "expected_batters", "batted_ball")
+    return _by_mlbid(_batter_features(names, player_ids), player_ids)
+
+def build_pitchers():
+    player_ids, names = _savant_players("exit_pitchers", "expected_pitchers")
+    return _by_mlbid(_pitcher_features(names, player_ids), player_ids)
+
+BUILDERS = {"batters": build_batters, "pitchers": build_pitchers}
+
+
+# --- materialization ---
+
+def table_path(name):
+    return data_store.SNAPSHOT_DIR / f"features_{name}.arrow"
+
+def _input_signature(name):
+    return {table: list(data_store.source_signature(table)) for table in INPUTS[name]}
+
+def _read_manifest():
+    try:
+        return json.loads(MANIFEST_PATH.read_text())
+    except (OSError, ValueError):
+        return {}
+
+def _read_materialized(name, signature):
+    """The stored table if it was built from exactly these inputs, else None."""
+    if _read_manifest().get(name) != signature or not table_path(name).exists():
+        return None
+    return data_store.map_arrow(table_path(name))
+
+def _write_materialized(name, signature, frame):
+    data_store.SNAPSHOT_DIR.mkdir(exist_ok=True)
+    data_store.write_arrow(table_path(name), frame, preserve_index=True)
+    with _lock:
+        manifest = _read_manifest()
+        manifest[name] = signature
+        tmp = MANIFEST_PATH.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(manifest, indent=2))
+        os.replace(tmp, MANIFEST_PATH)
+
+def _table(name):
+    signature = _input_signature(name)
+    with _lock:
+        entry = _built.get(name)
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+    frame = _read_materialized(name, signature)
+    if frame is None:
+        with timed("feature_table_build", table=name):
+            frame = BUILDERS[name]()
+        try:
+            _write_materialized(name, signature, frame)
+        except OSError:
+            pass  # read-only deployments still get the in-memory table
+    with _lock:
+        _built[name] = (signature, frame)
+    return frame
+
+def materialize():
+    """Build and store every table whose inputs changed; returns the names rebuilt."""
+    stale = [name for name in BUILDERS if _read_manifest().get(name) != _input_signature(name)]
+    for name in BUILDERS:
+        _table(name)
+    return stale
+
+def clear():
+    with _lock:
+        _built.clear()
+
+def batters():
+    """The batter feature table (read-only view), indexed by MLBID."""
+    return _table("batters").copy(deep=False)
+
+def pitchers():
+    """The pitcher feature table (read-only view), indexed by MLBID."""
+    return _table("pitchers").copy(deep=False)
+
+
+# --- row selection ---
+
+def _rows(table, names, player_ids, fallback):
+    """Rows of `table` in lineup order by MLBAM id; players without a row are built by fallback(names, ids)."""
+    names, player_ids = list(names), list(player_ids)
+    pos = table.index.get_indexer(pd.array(player_ids, dtype="Int64"))
+    hit, miss = np.flatnonzero(pos >= 0), np.flatnonzero(pos < 0)
+    out = table.iloc[pos[hit]].reset_index(drop=True).set_axis(hit)
+    if len(miss):
+        extra = fallback([names[i] for i in miss], [player_ids[i] for i in miss]).set_axis(miss)
+        out = pd.concat([out, extra]).sort_index() if len(hit) else extra
+    # the boxscore spelling, not the Savant one
+    out["Name"] = names
+    return out.reset_index(drop=True)
+
+def batter_rows(names, player_ids):
+    return _rows(batters(), names, player_ids, _batter_features)
+
+def pitcher_rows(names, player_ids):
+    return _rows(pitchers(), names, player_ids, _pitcher_features)
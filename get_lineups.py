@@ -1,5 +1,7 @@
-import requests
-from datetime import datetime
+from typing import NamedTuple, Optional
+
+from statsapi import client, is_final
+from instrumentation import timed
 
 TEAM_NAME_MAP = {
     "ARI": "Arizona Diamondbacks", "ATL": "Atlanta Braves", "BAL": "Baltimore Orioles",
@@ -19,54 +21,105 @@ TEAM_NAME_ALIASES = {
     "OAK": "Athletics"
 }
 
-def get_players_and_pitchers(team1_abbr, team2_abbr):
-    today = datetime.now().strftime("%Y-%m-%d")
-    schedule_url = f"https://statsapi.mlb.com/api/v1/schedule?sportId=1&date={today}"
-    schedule = requests.get(schedule_url).json()
+# full team name (either spelling) -> abbreviation
+TEAM_ABBR = {name: abbr for abbr, name in TEAM_NAME_MAP.items()}
+TEAM_ABBR.update({name: abbr for abbr, name in TEAM_NAME_ALIASES.items()})
+
+def todays_games(schedule=None):
+    """Every game in today's schedule (or in the schedule JSON passed in)."""
+    if schedule is None:
+        schedule = client.schedule()
+    return [game for date in schedule.get("dates", []) for game in date.get("games", [])]
+
+class LineupPlayer(NamedTuple):
+    id: Optional[int]  # MLBAM person id (None for an unannounced starter)
+    name: str
+    order: int         # battingOrder slot (100, 200, ...; 999 when not posted, 0 for pitchers)
+    side: str          # "home" or "away"
+    team: str          # full team name
+
+
+class Lineup(NamedTuple):
+    batters: list   # LineupPlayer, home side first, each side in batting order
+    pitchers: list  # [away probable, home probable] LineupPlayer
+
+    def opponent(self, batter):
+        """The probable pitcher a batter faces (home bats vs the away starter)."""
+        return self.pitchers[0] if batter.side == "home" else self.pitchers[1]
+
+    @property
+    def opponents(self):
+        return [self.opponent(batter) for batter in self.batters]
 
+
+def _team_lineup(box, team_key, team):
+    """Batting-order sorted LineupPlayers for one side of a boxscore."""
+    team_players = box["teams"].get(team_key, {}).get("players", {})
+    lineup = []
+    for player in team_players.values():
+        if "battingOrder" in player:
+            order = int(player["battingOrder"])
+        elif "stats" in player or "position" in player:
+            order = 999  # Fallback: include if no battingOrder
+        else:
+            continue
+        person = player["person"]
+        lineup.append(LineupPlayer(person.get("id"), person["fullName"], order, team_key, team))
+    return sorted(lineup, key=lambda p: (p.order, p.name))
+
+def _probable_pitcher(game, side):
+    team = game["teams"][side]
+    probable = team.get("probablePitcher", {})
+    return LineupPlayer(probable.get("id"), probable.get("fullName", "TBD"), 0, side, team["team"]["name"])
+
+def lineup_records(game, box):
+    """Lineup (MLBAM ids, names, order, side, team) for a schedule entry and its boxscore."""
+    batters = []
+    for team_key in ["home", "away"]:
+        batters.extend(_team_lineup(box, team_key, game["teams"][team_key]["team"]["name"]))
+    return Lineup(batters, [_probable_pitcher(game, "away"), _probable_pitcher(game, "home")])
+
+def lineup_from_boxscore(game, box):
+    """Return (batters, [away_pitcher, home_pitcher]) names for a schedule entry and its boxscore."""
+    lineup = lineup_records(game, box)
+    return [b.name for b in lineup.batters], [p.name for p in lineup.pitchers]
+
+def _find_game(team1_abbr, team2_abbr, schedule=None):
     team1_name = TEAM_NAME_ALIASES.get(team1_abbr, TEAM_NAME_MAP[team1_abbr.upper()])
     team2_name = TEAM_NAME_ALIASES.get(team2_abbr, TEAM_NAME_MAP[team2_abbr.upper()])
 
-    for date in schedule.get("dates", []):
-        for game in date.get("games", []):
-            away = game["teams"]["away"]["team"]["name"]
-            home = game["teams"]["home"]["team"]["name"]
-            if {away, home} == {team1_name, team2_name}:
-                game_id = game["gamePk"]
-                box_url = f"https://statsapi.mlb.com/api/v1/game/{game_id}/boxscore"
-                box = requests.get(box_url).json()
-
-                batters = []
-                for team_key in ["home", "away"]:
-                    if team_key not in box["teams"]:
-                        continue
-                    team_players = box["teams"][team_key].get("players", {})
-                    lineup = []
-                    for player in team_players.values():
-                        name = player["person"]["fullName"]
-                        if "battingOrder" in player:
-                            lineup.append((int(player["battingOrder"]), name))
-                        elif "stats" in player or "position" in player:
-                            lineup.append((999, name))  # Fallback: include if no battingOrder
-                    sorted_names = [name for _, name in sorted(lineup)]
-                    batters.extend(sorted_names)
-
-                away_pitcher = game["teams"]["away"].get("probablePitcher", {}).get("fullName", "TBD")
-                home_pitcher = game["teams"]["home"].get("probablePitcher", {}).get("fullName", "TBD")
-
-                return batters, [away_pitcher, home_pitcher]
-
-    return [], ["TBD", "TBD"]
+    for game in todays_games(schedule):
+        away = game["teams"]["away"]["team"]["name"]
+        home = game["teams"]["home"]["team"]["name"]
+        if {away, home} == {team1_name, team2_name}:
+            return game, client.boxscore(game["gamePk"], final=is_final(game))
+    return None, None
+
+@timed("lineup_fetch")
+def get_players_and_pitchers(team1_abbr, team2_abbr, schedule=None):
+    game, box = _find_game(team1_abbr, team2_abbr, schedule)
+    if game is None:
+        return [], ["TBD", "TBD"]
+    return lineup_from_boxscore(game, box)
+
+@timed("lineup_fetch")
+def get_lineup(team1_abbr, team2_abbr, schedule=None):
+    """Lineup records for a matchup; empty batters and TBD pitchers when the game isn't on the schedule."""
+    game, box = _find_game(team1_abbr, team2_abbr, schedule)
+    if game is None:
+        tbd = LineupPlayer(None, "TBD", 0, "", "")
+        return Lineup([], [tbd._replace(side="away"), tbd._replace(side="home")])
+    return lineup_records(game, box)
 
 if __name__ == "__main__":
     import sys
     if len(sys.argv) != 3:
         print("Usage: python3 get_lineups.py TEAM1 TEAM2")
     else:
-        batters, pitchers = get_players_and_pitchers(sys.argv[1], sys.argv[2])
+        lineup = get_lineup(sys.argv[1], sys.argv[2])
         print("Batters:")
-        for b in batters:
-            print("-", b)
+        for b in lineup.batters:
+            print("-", b.name, f"({b.id}, {b.team})")
         print("\nPitchers:")
-        for p in pitchers:
-            print("-", p)
+        for p in lineup.pitchers:
+            print("-", p.name, f"({p.id})")
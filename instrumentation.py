@@ -0,0 +1,126 @@
+"""Process-wide stage timers and counters.
+
+Cheap enough to leave on: every update is a dict write under one lock.
+Use `timed(name)` as a context manager or decorator and `count(name)` for
+events (cache hits, network calls, bytes). Counters and timers take
+optional labels, e.g. count("http_requests", endpoint="schedule").
+`snapshot()` / `delta()` feed the app's debug panel; `to_json()` and
+`to_prometheus()` export the same numbers.
+"""
+import functools
+import json
+import re
+import threading
+import time
+
+PREFIX = "batter_tool"
+
+_lock = threading.Lock()
+_counters = {}  # (name, labels) -> value
+_timers = {}    # (name, labels) -> [count, total seconds, max seconds]
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+def count(name, n=1, **labels):
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + n
+
+def observe(name, seconds, **labels):
+    key = _key(name, labels)
+    with _lock:
+        entry = _timers.get(key)
+        if entry is None:
+            _timers[key] = [1, seconds, seconds]
+        else:
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] = max(entry[2], seconds)
+
+class timed:
+    """Time a block (`with timed("stage"):`) or every call of a function (`@timed("stage")`)."""
+
+    def __init__(self, name, **labels):
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.name, time.perf_counter() - self._start, **self.labels)
+        return False
+
+    def __call__(self, fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with timed(self.name, **self.labels):
+                return fn(*args, **kwargs)
+        return wrapper
+
+
+def _label_text(labels):
+    return "{" + ",".join(f'{k}="{v}"' for k, v in labels) + "}" if labels else ""
+
+def snapshot():
+    """{"counters": {"name{labels}": value}, "timers": {"name{labels}": {count, total_s, max_s}}}."""
+    with _lock:
+        counters = dict(_counters)
+        timers = {key: list(entry) for key, entry in _timers.items()}
+    return {
+        "counters": {name + _label_text(labels): value for (name, labels), value in sorted(counters.items())},
+        "timers": {
+            name + _label_text(labels): {"count": c, "total_s": total, "max_s": peak}
+            for (name, labels), (c, total, peak) in sorted(timers.items())
+        },
+    }
+
+def delta(before, after=None):
+    """What changed between two snapshots (e.g. around one button click); max_s is the later run's."""
+    after = after or snapshot()
+    counters = {k: v - before["counters"].get(k, 0) for k, v in after["counters"].items()}
+    timers = {}
+    for k, t in after["timers"].items():
+        prev = before["timers"].get(k, {"count": 0, "total_s": 0.0})
+        if t["count"] != prev["count"]:
+            timers[k] = {"count": t["count"] - prev["count"], "total_s": t["total_s"] - prev["total_s"],
+                         "max_s": t["max_s"]}
+    return {"counters": {k: v for k, v in counters.items() if v}, "timers": timers}
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _timers.clear()
+
+def to_json(snap=None):
+    return json.dumps(snap or snapshot(), indent=2)
+
+def _metric(prefix, name, suffix):
+    return re.sub(r"[^a-zA-Z0-9_:]", "_", f"{prefix}_{name}{suffix}")
+
+def to_prometheus(prefix=PREFIX):
+    """Prometheus text exposition: counters as *_total, timers as *_seconds summaries plus a *_seconds_max gauge."""
+    with _lock:
+        counters = sorted(_counters.items())
+        timers = sorted((key, list(entry)) for key, entry in _timers.items())
+
+    families = {}  # metric -> (type, [sample lines]), in first-seen order
+    def sample(metric, kind, suffix, labels, value):
+        families.setdefault(metric, (kind, []))[1].append(f"{metric}{suffix}{_label_text(labels)} {value}")
+
+    for (name, labels), value in counters:
+        sample(_metric(prefix, name, "_total"), "counter", "", labels, value)
+    for (name, labels), (c, total, peak) in timers:
+        metric = _metric(prefix, name, "_seconds")
+        sample(metric, "summary", "_count", labels, c)
+        sample(metric, "summary", "_sum", labels, f"{total:.6f}")
+        sample(metric + "_max", "gauge", "", labels, f"{peak:.6f}")
+
+    lines = []
+    for metric, (kind, samples) in families.items():
+        lines.append(f"# TYPE {metric} {kind}")
+        lines.extend(samples)
+    return "\n".join(lines) + "\n"
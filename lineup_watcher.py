@@ -0,0 +1,217 @@
+"""Background watcher that re-joins a game's features when its lineup changes.
+
+Lineups post at different times, and until a team's batting order is out
+the boxscore only lists the roster. The watcher polls the day's schedule
+and every unfinished game's boxscore (revalidated with ETag /
+If-Modified-Since through the shared StatsAPI client), and when a game's
+batting order or probable pitchers change it rebuilds the season +
+matchup features for that game only. Each update is appended to a
+sequence-numbered log, and every reader (one per UI session) keeps its
+own position in it, so all sessions see every update. A shared watcher
+stops polling once nobody has read from it for `idle_timeout` seconds;
+get_watcher() starts it again on the next read.
+
+Polls ask the client for fresh data only (stale_ok=False), so an outage
+raises instead of replaying the cached lineup, and the watcher backs off.
+Point STATSAPI_BASE_URL at a local fake server to run it offline;
+tests/test_lineup_watcher.py does that.
+
+Usage: python3 lineup_watcher.py [--date YYYY-MM-DD] [--interval SECONDS]
+"""
+import argparse
+import threading
+import time
+from collections import deque
+from typing import NamedTuple
+
+import pandas as pd
+
+from get_lineups import todays_games, lineup_records
+from statsapi import client as default_client, is_final
+
+POLL_INTERVAL = 60        # seconds between polls while requests succeed
+MAX_INTERVAL = 15 * 60    # backoff ceiling after repeated failures
+IDLE_TIMEOUT = 10 * 60    # a shared watcher nobody reads from stops after this long
+LOG_SIZE = 500            # updates kept for readers that fall behind
+
+
+class GameUpdate(NamedTuple):
+    game_pk: int
+    label: str
+    batters: list
+    pitchers: list
+    confirmed: bool   # both batting orders have posted
+    reason: str       # "new", "batting order", "probable pitcher"
+    at: float         # time.time() of the poll that saw the change
+
+
+def lineup_confirmed(box):
+    """True once both teams' boxscores carry a battingOrder."""
+    return all(
+        any("battingOrder" in player for player in box["teams"].get(side, {}).get("players", {}).values())
+        for side in ("home", "away")
+    )
+
+def _reason(old, lineup):
+    if old is None:
+        return "new"
+    if old.pitchers != lineup.pitchers:
+        return "probable pitcher"
+    return "batting order"
+
+
+class LineupWatcher:
+    """Poll one day's games and keep per-game features current.
+
+    poll_once() does a single synchronous pass and returns the updates it
+    found; start() runs it on a daemon thread every `interval` seconds,
+    doubling the wait after a failed poll up to `max_interval`. With an
+    `idle_timeout`, the thread exits once updates_since() and features()
+    have gone unread that long.
+    """
+
+    def __init__(self, date=None, client=None, interval=POLL_INTERVAL, max_interval=MAX_INTERVAL, build=None,
+                 idle_timeout=None):
+        self.date = date
+        self.client = client or default_client
+        self.interval = interval
+        self.max_interval = max_interval
+        self.build = build or _default_build
+        self.idle_timeout = idle_timeout
+        self.errors = 0           # consecutive failed polls
+        self.wait = interval      # seconds until the next poll
+        self.seq = 0              # sequence number of the newest update
+        self.last_read = time.time()
+        self._log = deque(maxlen=LOG_SIZE)  # (seq, GameUpdate), oldest first
+        self._lineups = {}   # game_pk -> Lineup
+        self._features = {}  # game_pk -> features frame for that game
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def poll_once(self):
+        """Check every unfinished game once; rebuild and log the ones whose lineup changed."""
+        from slate import game_label
+
+        changed = []
+        # ttl=0 always revalidates; unchanged responses come back as cheap 304s, failures raise
+        games = todays_games(self.client.schedule(self.date, ttl=0, stale_ok=False))
+        for game in games:
+            game_pk = game["gamePk"]
+            final = is_final(game)
+            if final and game_pk in self._lineups:
+                continue
+            box = self.client.boxscore(game_pk, final=final, ttl=0, stale_ok=False)
+            lineup = lineup_records(game, box)
+            old = self._lineups.get(game_pk)
+            if old == lineup:
+                continue
+
+            label = game_label(game)
+            features = self.build([(label, lineup)])
+            with self._lock:
+                self._lineups[game_pk] = lineup
+                self._features[game_pk] = features
+            update = GameUpdate(game_pk, label, [b.name for b in lineup.batters], [p.name for p in lineup.pitchers],
+                                lineup_confirmed(box), _reason(old, lineup), time.time())
+            with self._lock:
+                self.seq += 1
+                self._log.append((self.seq, update))
+            changed.append(update)
+
+        # games dropped from the schedule (postponed) lose their features
+        live = {game["gamePk"] for game in games}
+        with self._lock:
+            for game_pk in set(self._lineups) - live:
+                del self._lineups[game_pk]
+                del self._features[game_pk]
+        return changed
+
+    def features(self):
+        """Current features for every watched game, in one frame."""
+        with self._lock:
+            self.last_read = time.time()
+            frames = list(self._features.values())
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    def updates_since(self, seq=0):
+        """(updates after sequence number `seq`, oldest first; the newest sequence number).
+
+        Pass the returned number back in on the next call to get only what is new.
+        """
+        with self._lock:
+            self.last_read = time.time()
+            return [update for n, update in self._log if n > seq], self.seq
+
+    def _idle(self):
+        return self.idle_timeout is not None and time.time() - self.last_read > self.idle_timeout
+
+    def _run(self):
+        self.wait = self.interval
+        while not self._stop.is_set() and not self._idle():
+            try:
+                self.poll_once()
+                self.errors = 0
+                self.wait = self.interval
+            except Exception:
+                self.errors += 1
+                self.wait = min(self.wait * 2, self.max_interval)
+            self._stop.wait(self.wait)
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self.last_read = time.time()
+            self._thread = threading.Thread(target=self._run, name="lineup-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+
+def _default_build(lineups):
+    from slate import slate_batters
+    return slate_batters(lineups)
+
+
+_watchers = {}
+_watchers_lock = threading.Lock()
+
+def get_watcher(date=None, interval=POLL_INTERVAL, idle_timeout=IDLE_TIMEOUT):
+    """Process-wide running watcher for a date, so every session shares one poller.
+
+    It stops by itself once no session has read it for `idle_timeout`
+    seconds and is restarted here on the next call.
+    """
+    with _watchers_lock:
+        watcher = _watchers.get(date)
+        if watcher is None:
+            watcher = _watchers[date] = LineupWatcher(date, interval=interval, idle_timeout=idle_timeout)
+        return watcher.start()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Print lineup changes as they post.")
+    parser.add_argument("--date", help="YYYY-MM-DD (default: today)")
+    parser.add_argument("--interval", type=float, default=POLL_INTERVAL)
+    args = parser.parse_args()
+
+    watcher = LineupWatcher(args.date, interval=args.interval).start()
+    seq = 0
+    try:
+        while True:
+            updates, seq = watcher.updates_since(seq)
+            for update in updates:
+                status = "confirmed" if update.confirmed else "projected"
+                print(f"{time.strftime('%H:%M:%S')} {update.label}: {update.reason} ({status}, "
+                      f"{len(update.batters)} batters, {' vs '.join(update.pitchers)})")
+            time.sleep(1)
+    except KeyboardInterrupt:
+        watcher.stop()
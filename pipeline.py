@@ -0,0 +1,309 @@
+"""The ranking pipeline as plain importable functions.
+
+Both the Streamlit app and the API server (server.py) call these. Feature
+frames are cached process-wide, keyed by matchup and lineup fingerprint,
+with one build per key even under concurrent requests; scoring always
+runs fresh on the cached features, so it is cheap to call per request.
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import NamedTuple
+
+import pandas as pd
+
+import data_store
+import statcast_store
+import statsapi
+from get_lineups import TEAM_ABBR, get_lineup
+from instrumentation import count, timed
+from player_ids import lookup_player_id, get_id_cache
+from recent_form import fetch_statcast_frames, aggregate_recent_form, window_stats, WINDOWS
+from scoring import rank_frame
+
+SEASON_STATS = ["EV", "Barrel %", "xSLG", "FB %", "RightFly", "LeftFly",
+                "Opp Hard-Hit %", "Opp Barrel %", "Opp xSLG", "Opp xwOBA", "Platoon Adv", "Wind Carry"]
+RECENT_STATS = ["EV", "Barrel %", "FB %", "HardHit %"]
+FEATURE_CACHE_SIZE = 64
+PARTIAL_TTL = 5 * 60  # seconds a RecentForm with failed fetches is served before they are retried
+
+
+class RecentForm(NamedTuple):
+    player_ids: dict  # lineup name -> MLBAM id (or None)
+    form: pd.DataFrame  # aggregate_recent_form output, every window in WINDOWS
+    failed: list  # names whose Statcast fetch failed or timed out
+
+
+# --- process-wide feature cache ---
+
+_cache_lock = threading.Lock()
+_features = OrderedDict()  # key -> (fingerprint, value, expires_at or None)
+_building = {}  # key -> lock held while that key is being built
+
+
+def lineup_fingerprint(lineup):
+    """Changes whenever a batting order or probable pitcher changes."""
+    return hash(repr(lineup))
+
+def _current(entry, fingerprint):
+    return entry is not None and entry[0] == fingerprint and (entry[2] is None or time.time() < entry[2])
+
+def cached_features(key, fingerprint, build, refresh=False, ttl=None):
+    """build() once per (key, fingerprint); concurrent callers for the same key wait for one build.
+
+    `ttl(value)` may return seconds after which a built value is rebuilt
+    (None keeps it until the fingerprint changes or it is evicted).
+    """
+    with _cache_lock:
+        seen = _features.get(key)
+        if not refresh and _current(seen, fingerprint):
+            _features.move_to_end(key)
+            return seen[1]
+        key_lock = _building.setdefault(key, threading.Lock())
+    with key_lock:
+        with _cache_lock:
+            entry = _features.get(key)
+        # another caller (re)built this key while we waited for the lock
+        if entry is not seen and _current(entry, fingerprint):
+            return entry[1]
+        value = build()
+        seconds = ttl(value) if ttl is not None else None
+        with _cache_lock:
+            _features[key] = (fingerprint, value, None if seconds is None else time.time() + seconds)
+            _features.move_to_end(key)
+            while len(_features) > FEATURE_CACHE_SIZE:
+                evicted, _ = _features.popitem(last=False)
+                _building.pop(evicted, None)
+        return value
+
+def clear_features():
+    with _cache_lock:
+        _features.clear()
+        _building.clear()
+
+
+# --- warm-up ---
+
+_warm_thread = None
+
+
+def _warm():
+    import features
+    from scrape_stats import load_csvs
+    from weather import get_weather
+
+    with timed("warm_up"):
+        load_csvs()
+        data_store.handedness_map()
+        features.batters()
+        features.pitchers()
+        try:
+            get_weather()
+        except Exception:
+            pass  # the Weather tab reports it
+
+def warm_up():
+    """Load the reference and feature tables (and the weather page) on a background thread, once per process."""
+    global _warm_thread
+    with _cache_lock:
+        if _warm_thread is None:
+            _warm_thread = threading.Thread(target=_warm, name="warm-up", daemon=True)
+            _warm_thread.start()
+        return _warm_thread
+
+
+# --- matchups ---
+
+def matchups(date=None):
+    """Today's games (or `date`'s) as "AWAY @ HOME" abbreviations."""
+    result = []
+    for day in statsapi.client.schedule(date).get("dates", []):
+        for game in day.get("games", []):
+            away = game["teams"]["away"]["team"]["name"]
+            home = game["teams"]["home"]["team"]["name"]
+            if away in TEAM_ABBR and home in TEAM_ABBR:
+                result.append(f"{TEAM_ABBR[away]} @ {TEAM_ABBR[home]}")
+    return result
+
+def split_matchup(matchup):
+    """"NYY @ BOS" -> ("NYY", "BOS")."""
+    away, home = (team.strip().upper() for team in matchup.split("@"))
+    return away, home
+
+
+# --- season ---
+
+def season_features(team1, team2, refresh=False):
+    """Season, matchup and wind features for a matchup's lineups (team2 is the home team)."""
+    from scrape_stats import lineup_features
+    from weather import weather_or_empty
+
+    lineup = get_lineup(team1, team2)
+
+    def build():
+        with timed("feature_build", kind="season"):
+            return lineup_features(lineup.batters, lineup.opponents, [team2] * len(lineup.batters),
+                                   weather_or_empty())
+
+    key = ("season", team1, team2, datetime.now().date())
+    return cached_features(key, lineup_fingerprint(lineup), build, refresh)
+
+def rank_season(batters, stats, weights, method="zscore", nan_policy="drop"):
+    """Player / Score for a season_features frame, best first."""
+    ranked = rank_frame(batters, list(stats), list(weights), method, nan_policy)
+    return ranked[["Name", "Score"]].rename(columns={"Name": "Player"}).reset_index(drop=True)
+
+
+# --- recent form ---
+
+def resolve_batter(name):
+    """lookup_player_id, retrying with the first token for names it can't place."""
+    player_id = lookup_player_id(name)
+    if player_id is None:
+        name_parts = name.split(" ")
+        if len(name_parts) > 1:
+            player_id = lookup_player_id(name_parts[0])
+    return player_id
+
+_store_refreshed = None  # date this process last started a store top-up
+
+
+def _refresh_store():
+    try:
+        written = statcast_store.update(blocking=False)
+        count("statcast_store_refresh", result="busy" if written is None else "ok")
+    except Exception:
+        count("statcast_store_refresh", result="error")
+
+def refresh_store_daily():
+    """Top the Statcast store up in the background, at most once a day per process.
+
+    Covers the hours before the nightly `python statcast_store.py` has run.
+    Only one process pulls; the others find the store's lock taken and skip.
+    """
+    global _store_refreshed
+    today = datetime.now().date()
+    with _cache_lock:
+        if _store_refreshed == today:
+            return
+        _store_refreshed = today
+    threading.Thread(target=_refresh_store, name="statcast-refresh", daemon=True).start()
+
+def recent_span():
+    """(first, last) game date, as YYYY-MM-DD, that every recent-form window is read from.
+
+    The span is the max(WINDOWS) days ending at the store's last date, so
+    the store path and the per-batter fallback aggregate the same days.
+    """
+    last = statcast_store.last_game_date()
+    return (last - timedelta(days=max(WINDOWS) - 1)).isoformat(), last.isoformat()
+
+def _fetch_recent(batters, on_progress=None):
+    """RecentForm for LineupPlayers; lineup MLBAM ids are used as-is, the name resolver only fills gaps."""
+    known = {b.name: b.id for b in batters if b.id is not None}
+
+    def resolve(name):
+        if name in known:
+            count("player_id_source", source="lineup")
+            return known[name]
+        return resolve_batter(name)
+
+    names = list(dict.fromkeys(b.name for b in batters))
+    # every window is aggregated up front, so switching windows is only a re-score
+    span_start, span_end = recent_span()
+    # the store is filled by `python statcast_store.py` or refresh_store_daily(), never inside a request
+    if statcast_store.covers(span_start, span_end):
+        try:
+            with get_id_cache().batch():
+                player_ids = {name: resolve(name) for name in names}
+            pitches = statcast_store.load(span_start, span_end,
+                                          batters=[pid for pid in player_ids.values() if pid is not None])
+            form = aggregate_recent_form(pitches, as_of=span_end)
+            count("recent_form_source", source="store")
+            return RecentForm(player_ids, form, [])
+        except Exception:
+            pass
+
+    # store cold or unreadable: fall back to concurrent per-batter fetches
+    count("recent_form_source", source="per_batter")
+    refresh_store_daily()
+    player_ids, frames, failed = {}, [], []
+    form = aggregate_recent_form(pd.DataFrame())
+    total = len(names)
+    # the ID cache is written once, after every worker has resolved its player
+    with get_id_cache().batch():
+        for i, result in enumerate(fetch_statcast_frames(names, span_start, span_end, resolve=resolve), 1):
+            if result.error is not None:
+                failed.append(result.name)
+            elif result.frame is not None and not result.frame.empty:
+                player_ids[result.name] = result.player_id
+                frames.append(result.frame.assign(batter=result.player_id))
+                form = aggregate_recent_form(pd.concat(frames), as_of=span_end)
+            if on_progress is not None:
+                on_progress(i, total, RecentForm(player_ids, form, failed))
+    return RecentForm(player_ids, form, failed)
+
+def recent_features(team1, team2, refresh=False, on_progress=None):
+    """RecentForm for a matchup's batters. `on_progress(done, total, partial)` fires per player on the slow path."""
+    batters = get_lineup(team1, team2).batters
+
+    def build():
+        with timed("feature_build", kind="recent"):
+            return _fetch_recent(batters, on_progress)
+
+    key = ("recent", team1, team2, datetime.now().date())
+    # a form with failed fetches is only kept briefly, so those players are retried
+    return cached_features(key, lineup_fingerprint(batters), build, refresh,
+                           ttl=lambda recent: PARTIAL_TTL if recent.failed else None)
+
+def rank_recent(recent, window, weights, stats=RECENT_STATS, method="zscore", nan_policy="drop"):
+    """Player (with batting side) / Score for one window of a RecentForm, best first."""
+    stats = list(stats)
+    handedness = data_store.handedness_map()
+    by_id = window_stats(recent.form, window)
+    rows = []
+    for name, player_id in recent.player_ids.items():
+        if player_id not in by_id.index:
+            continue
+        side = handedness.get(name.lower().strip(), "")
+        label = f"{name} ({side})" if side else name
+        rows.append({"Player": label, **by_id.loc[player_id, stats]})
+
+    players = pd.DataFrame(rows, columns=["Player"] + stats)
+    ranked = rank_frame(players, stats, list(weights), method, nan_policy)
+    return ranked[["Player", "Score"]].reset_index(drop=True)
+
+
+# --- slate ---
+
+def slate_features(date=None, refresh=False):
+    """Features for every batter on the slate, one row per batter with its Game label."""
+    from slate import fetch_slate_lineups, slate_batters
+
+    lineups = fetch_slate_lineups(date)
+
+    def build():
+        with timed("feature_build", kind="slate"):
+            return slate_batters(lineups)
+
+    key = ("slate", date or datetime.now().date())
+    return cached_features(key, lineup_fingerprint(lineups), build, refresh)
+
+def rank_slate(stats, weights, date=None, method="zscore", nan_policy="drop"):
+    from slate import rank_batters
+    return rank_batters(slate_features(date), stats, weights, method, nan_policy)
+
+
+# --- weather ---
+
+def weather_for(team1, team2):
+    """The weather-table row for the home team's (team2's) park as a JSON-safe dict, or None.
+
+    Missing numbers are None.
+    """
+    from weather import get_weather, stadium_weather
+    row = stadium_weather(get_weather(), team2)
+    # to_json writes NaN as null and numpy scalars as plain JSON values
+    return None if row is None else json.loads(row.to_json())
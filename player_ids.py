@@ -0,0 +1,391 @@
+import re, json, unicodedata, sqlite3, threading, time
+import contextvars
+from contextlib import contextmanager
+from pathlib import Path
+from difflib import get_close_matches
+
+import pandas as pd
+
+import data_store
+import statsapi
+from instrumentation import count, timed
+
+# =========================
+# Robust player ID resolver
+# =========================
+
+# next to this module, whatever the working directory
+ID_CACHE_DB = Path(__file__).resolve().parent / "id_cache.sqlite"
+LEGACY_ID_CACHE_PATH = Path(__file__).resolve().parent / "id_cache.json"  # merged into the SQLite store on open
+NEGATIVE_TTL = 6 * 60 * 60  # seconds before a failed lookup is retried
+
+_SUFFIXES = {"jr", "sr", "ii", "iii", "iv", "v"}
+
+# Common nicknames → formal names (extend as needed)
+NICKNAME_MAP = {
+    "gio": ["giovanni"],
+    "mike": ["michael"],
+    "tony": ["anthony"],
+    "jim": ["james"],
+    "jimmy": ["james"],
+    "joe": ["joseph"],
+    "joey": ["joseph"],
+    "johnny": ["john"],
+    "nick": ["nicholas"],
+    "alex": ["alexander", "alejandro"],
+    "andy": ["andrew"],
+    "drew": ["andrew"],
+    "frankie": ["francisco"],
+    "fran": ["francisco", "francis"],
+    "pepe": ["jose"],
+    "javy": ["javier"],
+    "eddy": ["edward", "eduardo"],
+    "eddie": ["edward", "eduardo"],
+    "nate": ["nathan", "nathaniel"],
+    "jake": ["jacob"],
+    "zach": ["zachary"],
+    # initial-style first names
+    "j.t.": ["jt", "john thomas"],
+    "jj": ["jj", "jeffrey joseph", "jeffery joseph", "joseph james", "james joseph", "john joseph"],
+}
+
+def _strip_accents(s: str) -> str:
+    return "".join(c for c in unicodedata.normalize("NFD", s) if unicodedata.category(c) != "Mn")
+
+def _normalize_name(name: str) -> str:
+    s = name.strip().replace(",", " ")
+    s = s.replace("’", "'").replace(".", "")
+    s = re.sub(r"\s+", " ", s)
+    parts = [p for p in s.split() if p.lower().strip(".") not in _SUFFIXES]
+    s = " ".join(parts)
+    s = s.replace("-", " ")
+    s = re.sub(r"[^\w\s']", " ", s)
+    s = re.sub(r"\s+", " ", s).strip()
+    return s
+
+def _variants(full_name: str):
+    """Yield reasonable first/last variants (nicknames, initials, deaccented)."""
+    base = _normalize_name(full_name)
+    yield base
+
+    na = base.replace("'", "")
+    if na != base:
+        yield na
+
+    deacc = _strip_accents(base)
+    if deacc != base:
+        yield deacc
+    deacc_na = deacc.replace("'", "")
+    if deacc_na != deacc:
+        yield deacc_na
+
+    toks = base.split()
+    if len(toks) >= 2:
+        first, last = toks[0], " ".join(toks[1:])
+        # first + last only
+        fl = f"{first} {last.split()[-1]}"
+        if fl != base:
+            yield fl
+
+        # nickname expansions
+        lf = first.lower()
+        if lf in NICKNAME_MAP:
+            for exp in NICKNAME_MAP[lf]:
+                yield f"{exp.title()} {last}"
+
+        # “JJ” style initials
+        if re.fullmatch(r"[A-Za-z]{1,2}", first) and first.isupper():
+            if len(first) == 2:
+                yield f"{first[0]} {first[1]} {last}"
+                if first == "JJ" and "jj" in NICKNAME_MAP:
+                    for exp in NICKNAME_MAP["jj"]:
+                        yield f"{exp.title()} {last}"
+
+def _trigrams(s: str):
+    s = f"  {s} "
+    return {s[i:i + 3] for i in range(len(s) - 2)}
+
+
+class PlayerIdResolver:
+    """Hash indexes over player_id_map.csv, built once per table version.
+
+    Exact lookups are dict hits on lower-cased PLAYERNAME, "FIRST LAST",
+    MLBNAME and FANGRAPHSNAME (plus deaccented forms). Last-name typo repair
+    narrows the pool with a trigram index before running difflib.
+    """
+
+    def __init__(self, id_map):
+        self.by_playername = {}
+        self.by_fullname = {}
+        self.by_any = {}
+        last_names = {}
+
+        rows = zip(id_map["MLBID"], id_map["PLAYERNAME"], id_map["FIRSTNAME"], id_map["LASTNAME"],
+                   id_map["MLBNAME"], id_map["FANGRAPHSNAME"])
+        # first row wins everywhere, matching the old "row['MLBID'].values[0]" scans
+        for mlbid, player, first, last, mlb_name, fg_name in rows:
+            if pd.isna(mlbid):
+                continue
+            pid = int(mlbid)
+            player_key = str(player).lower()
+            full_key = f"{str(first).strip()} {str(last).strip()}".lower()
+            self.by_playername.setdefault(player_key, pid)
+            self.by_fullname.setdefault(full_key, pid)
+            for key in (player_key, full_key, str(mlb_name).lower(), str(fg_name).lower()):
+                self.by_any.setdefault(key, pid)
+                self.by_any.setdefault(_strip_accents(key), pid)
+            last_names.setdefault(str(last).lower(), None)
+
+        self.last_names = list(last_names)
+        self.trigram_index = {}
+        for i, last in enumerate(self.last_names):
+            for gram in _trigrams(last):
+                self.trigram_index.setdefault(gram, []).append(i)
+
+    def lastname_candidates(self, last: str, cutoff=0.86):
+        """Tiny-typo repair for last names (e.g., 'Ursela' → 'Urshela')."""
+        last = last.lower()
+        pool = set()
+        for gram in _trigrams(last):
+            pool.update(self.trigram_index.get(gram, ()))
+        return get_close_matches(last, [self.last_names[i] for i in pool], n=3, cutoff=cutoff)
+
+    def match(self, name: str):
+        """CSV exact -> CSV variants (incl. nickname & fuzzy last name); None if not in the map."""
+        lower = name.lower()
+        pid = self.by_playername.get(lower) or self.by_fullname.get(lower)
+        if pid:
+            return pid
+
+        for v in _variants(name):
+            pid = self.by_any.get(v.lower())
+            if pid:
+                return pid
+
+        # fuzzy last name try
+        toks = _normalize_name(name).split()
+        if len(toks) >= 2:
+            f, l = toks[0], toks[-1]
+            for lfix in self.lastname_candidates(l):
+                pid = self.by_any.get(f"{f} {lfix}".lower())
+                if pid:
+                    return pid
+                for exp in NICKNAME_MAP.get(f.lower(), []):
+                    pid = self.by_any.get(f"{exp} {lfix}".lower())
+                    if pid:
+                        return pid
+        return None
+
+
+def get_resolver():
+    """Shared resolver, rebuilt only when player_id_map.csv changes."""
+    return data_store.cached("player_id_map", PlayerIdResolver)
+
+
+class _Batch:
+    """Writes buffered by IdCache.batch(); closed once they have been committed."""
+
+    def __init__(self):
+        self.entries = {}  # name -> (mlbam, updated)
+        self.closed = False
+        self.lock = threading.Lock()
+
+
+class IdCache:
+    """Persistent name -> MLBAM id cache, shared by threads and processes.
+
+    Backed by SQLite in WAL mode, so concurrent sessions never clobber each
+    other's entries. Misses are stored as NULL ids and expire after
+    `negative_ttl` seconds. Inside ``with cache.batch():`` writes are
+    buffered in a context variable and committed in a single transaction;
+    worker threads started with a copy of the caller's context share it.
+    A worker that outlives the batch writes straight through instead.
+    """
+
+    def __init__(self, path=ID_CACHE_DB, negative_ttl=NEGATIVE_TTL):
+        self.path = Path(path)
+        self.negative_ttl = negative_ttl
+        self._local = threading.local()
+        self._pending = contextvars.ContextVar(f"id_cache_pending_{id(self)}", default=None)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS player_ids ("
+                "name TEXT PRIMARY KEY, mlbam INTEGER, updated REAL NOT NULL)"
+            )
+        self._import_legacy_json()
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _import_legacy_json(self):
+        if not LEGACY_ID_CACHE_PATH.exists():
+            return
+        try:
+            legacy = json.loads(LEGACY_ID_CACHE_PATH.read_text())
+        except Exception:
+            return
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO player_ids (name, mlbam, updated) VALUES (?, ?, ?)",
+                [(name, int(pid), now) for name, pid in legacy.items() if pid],
+            )
+
+    def get(self, name):
+        """Return (hit, mlbam); a hit with mlbam None is a cached miss."""
+        pending = self._pending.get()
+        if pending is not None and name in pending.entries:
+            return True, pending.entries[name][0]
+        row = self._connect().execute(
+            "SELECT mlbam, updated FROM player_ids WHERE name = ?", (name,)
+        ).fetchone()
+        if row is None:
+            return False, None
+        mlbam, updated = row
+        if mlbam is None and time.time() - updated > self.negative_ttl:
+            return False, None
+        return True, mlbam
+
+    def put(self, name, mlbam):
+        pending = self._pending.get()
+        if pending is not None:
+            with pending.lock:
+                if not pending.closed:
+                    pending.entries[name] = (mlbam, time.time())
+                    return
+        self._write({name: (mlbam, time.time())})
+
+    def _write(self, entries):
+        if not entries:
+            return
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO player_ids (name, mlbam, updated) VALUES (?, ?, ?)",
+                [(name, mlbam, updated) for name, (mlbam, updated) in entries.items()],
+            )
+
+    @contextmanager
+    def batch(self):
+        """Buffer writes made in this context and commit them together on exit."""
+        if self._pending.get() is not None:
+            yield self  # already batching
+            return
+        pending = _Batch()
+        token = self._pending.set(pending)
+        try:
+            yield self
+        finally:
+            self._pending.reset(token)
+            with pending.lock:
+                pending.closed = True  # copies of this context still running now write directly
+            try:
+                self._write(pending.entries)
+            except sqlite3.Error:
+                pass
+
+
+_id_cache = None
+_id_cache_lock = threading.Lock()
+
+def get_id_cache():
+    """The shared IdCache, opened on first use so importing this module touches no files."""
+    global _id_cache
+    with _id_cache_lock:
+        if _id_cache is None:
+            _id_cache = IdCache()
+        return _id_cache
+
+
+def playerid_lookup(last, first):
+    """pybaseball.playerid_lookup, imported on first use (pybaseball drags in matplotlib)."""
+    from pybaseball import playerid_lookup as lookup
+    return lookup(last, first)
+
+def _search_statsapi_person_id(name: str):
+    """Last-resort: MLB StatsAPI fuzzy search by name.
+
+    Returns (pid, answered); answered is False when the request itself failed.
+    """
+    try:
+        data = statsapi.client.search_people(name)
+    except Exception:
+        return None, False
+    people = data.get("people", [])
+    if people:
+        return int(people[0]["id"]), True
+    return None, True
+
+def _remember(name, pid):
+    try:
+        get_id_cache().put(name, pid)
+    except sqlite3.Error:
+        pass
+    return pid
+
+def lookup_player_id(name: str):
+    """
+    Cache -> CSV indexes (exact, variants, fuzzy last name) -> pybaseball -> StatsAPI.
+    """
+    if not name:
+        return None
+
+    # cache (positive hits, plus recent misses that aren't worth retrying yet)
+    try:
+        hit, pid = get_id_cache().get(name)
+        count("id_cache_lookups", result=("negative" if pid is None else "hit") if hit else "miss")
+        if hit:
+            count("player_id_source", source="cache")
+            return pid
+    except sqlite3.Error:
+        pass
+
+    # 1) + 2) CSV exact and variants
+    try:
+        pid = get_resolver().match(name)
+        if pid:
+            count("player_id_source", source="resolver")
+            return _remember(name, pid)
+    except Exception:
+        pass
+
+    # 3) pybaseball fallback on variants
+    pybaseball_ok = True
+    try:
+        for v in _variants(name):
+            toks = v.split()
+            if len(toks) >= 2:
+                f, l = toks[0], " ".join(toks[1:])
+                with timed("pybaseball_lookup"):
+                    df = playerid_lookup(l, f)
+                if df is not None and not df.empty:
+                    if 'mlb_played_last' in df.columns:
+                        df = df.sort_values(by='mlb_played_last', ascending=False)
+                    pid = int(df.iloc[0]['key_mlbam'])
+                    count("player_id_source", source="pybaseball")
+                    return _remember(name, pid)
+    except Exception:
+        pybaseball_ok = False
+
+    # 4) StatsAPI last-resort
+    pid, answered = _search_statsapi_person_id(name)
+    if pid:
+        count("player_id_source", source="statsapi")
+        return _remember(name, pid)
+
+    count("player_id_source", source="none")
+
+    # only cache the miss if every source actually answered
+    if pybaseball_ok and answered:
+        _remember(name, None)
+    return None
+
+def lookup_player_ids(names):
+    """Resolve a whole lineup with one cache write; returns {name: MLBAM id or None}."""
+    with get_id_cache().batch():
+        return {name: lookup_player_id(name) for name in names}
@@ -0,0 +1,197 @@
+"""Recent-form (11-Day tab) data stage and aggregation engine.
+
+Player IDs are resolved and Statcast frames fetched on a bounded thread
+pool, so one slow request no longer blocks the whole lineup. Results are
+yielded as they complete for partial rendering. aggregate_recent_form()
+turns any pitch-level frame into per-batter metrics for several windows
+in one vectorized pass.
+"""
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+from instrumentation import timed
+
+MAX_WORKERS = 8
+REQUEST_TIMEOUT = 30.0  # seconds per player, including retries
+RETRIES = 2
+BACKOFF = 1.0  # seconds, doubled after every failed attempt
+
+
+class FetchResult(NamedTuple):
+    name: str
+    player_id: Optional[int]
+    frame: Optional[pd.DataFrame]
+    error: Optional[BaseException]
+
+
+def _default_fetch(start_dt, end_dt, player_id):
+    from pybaseball import statcast_batter
+    with timed("pybaseball_statcast_batter"):
+        return statcast_batter(start_dt, end_dt, player_id)
+
+def _default_resolve(name):
+    from player_ids import lookup_player_id
+    return lookup_player_id(name)
+
+def _fetch_one(name, start_dt, end_dt, resolve, fetch, retries, backoff, started, abandoned):
+    started[name] = time.monotonic()
+    player_id = resolve(name)
+    if player_id is None:
+        return player_id, None
+    for attempt in range(retries + 1):
+        if abandoned.is_set():
+            raise TimeoutError(f"Statcast fetch for {name} abandoned")
+        try:
+            return player_id, fetch(start_dt, end_dt, player_id)
+        except Exception:
+            if attempt == retries:
+                raise
+            abandoned.wait(backoff * 2 ** attempt)
+
+def fetch_statcast_frames(names, start_dt, end_dt, resolve=None, fetch=None, max_workers=MAX_WORKERS,
+                          timeout=REQUEST_TIMEOUT, retries=RETRIES, backoff=BACKOFF):
+    """Resolve and fetch every batter concurrently, yielding FetchResult as each one finishes.
+
+    `resolve(name)` and `fetch(start_dt, end_dt, player_id)` default to
+    player_ids.lookup_player_id and pybaseball.statcast_batter; pass stubs
+    to run offline. A player still running after `timeout` seconds is
+    reported with a TimeoutError and abandoned: a request already in
+    flight can't be interrupted, but it is never retried once the call
+    has returned.
+    """
+    resolve = resolve or _default_resolve
+    fetch = fetch or _default_fetch
+    names = list(dict.fromkeys(names))
+    started = {}
+    abandoned = threading.Event()
+
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    # each task runs in a copy of the caller's context, so an open get_id_cache().batch() covers it
+    futures = {
+        pool.submit(contextvars.copy_context().run, _fetch_one,
+                    name, start_dt, end_dt, resolve, fetch, retries, backoff, started, abandoned): name
+        for name in names
+    }
+    pending = set(futures)
+    try:
+        while pending:
+            done, pending = wait(pending, timeout=0.25, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = futures[future]
+                try:
+                    player_id, frame = future.result()
+                    yield FetchResult(name, player_id, frame, None)
+                except Exception as e:
+                    yield FetchResult(name, None, None, e)
+
+            now = time.monotonic()
+            for future in list(pending):
+                name = futures[future]
+                if name in started and now - started[name] > timeout:
+                    pending.discard(future)
+                    future.cancel()
+                    yield FetchResult(name, None, None, TimeoutError(f"Statcast fetch for {name} timed out"))
+    finally:
+        # don't wait on abandoned requests; queued ones are dropped and running ones stop retrying
+        abandoned.set()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+# === Aggregation engine ===
+
+WINDOWS = (7, 11, 14, 30)
+HARD_HIT_EV = 95.0
+FB_ANGLE = 25.0
+METRICS = ["EV", "HardHit %", "Barrel %", "FB %"]
+
+
+def is_barrel(launch_speed, launch_angle):
+    """Statcast barrel zone: 98+ mph, with the 26-30 degree band widening to 8-50 degrees at 116 mph."""
+    ls = np.asarray(launch_speed, dtype=float)
+    la = np.asarray(launch_angle, dtype=float)
+    # Savant's published band: 99 mph 25-31, 100 mph 24-33, 116+ mph 8-50
+    low = np.interp(ls, [98.0, 116.0], [26.0, 8.0])
+    high = np.interp(ls, [98.0, 99.0, 100.0, 116.0], [30.0, 31.0, 33.0, 50.0])
+    return (ls >= 98.0) & (la >= low) & (la <= high)
+
+def _batted_ball_mask(pitches):
+    mask = pitches["launch_speed"].notna().to_numpy()
+    if "type" in pitches:
+        mask = mask & (pitches["type"] == "X").to_numpy()
+    return mask
+
+def _barrels(pitches):
+    barrel = is_barrel(pitches["launch_speed"], pitches["launch_angle"])
+    if "launch_speed_angle" in pitches:
+        # trust Savant's own classification (code 6) wherever it is present
+        code = pd.to_numeric(pitches["launch_speed_angle"], errors="coerce").to_numpy(dtype=float)
+        barrel = np.where(np.isnan(code), barrel, code == 6)
+    return barrel
+
+def aggregate_recent_form(pitches, windows=WINDOWS, as_of=None):
+    """Recent-form metrics for every batter in a pitch-level frame, for several windows at once.
+
+    Each window w covers the w game dates ending at `as_of` (default: the
+    latest date in the frame). Per-batter daily totals are built with one
+    bincount per metric and windows are read off their prefix sums by date.
+
+    Returns a tidy frame with columns batter, window, BBE, EV, HardHit %,
+    Barrel % and FB % (percentages on a 0-100 scale, NaN when a window has
+    no batted balls).
+    """
+    windows = sorted({int(w) for w in windows})
+    span = windows[-1]
+    columns = ["batter", "window", "BBE"] + METRICS
+    if pitches.empty:
+        return pd.DataFrame(columns=columns)
+
+    dates = pd.to_datetime(pitches["game_date"]).dt.normalize()
+    as_of = pd.Timestamp(as_of).normalize() if as_of is not None else dates.max()
+    age = (as_of - dates).dt.days.to_numpy()
+    keep = (age >= 0) & (age < span) & _batted_ball_mask(pitches)
+
+    codes, batters = pd.factorize(pitches["batter"].to_numpy()[keep])
+    day = span - 1 - age[keep]  # column 0 is the oldest date in the span
+    flat = codes * span + day
+    size = len(batters) * span
+
+    ls = pitches["launch_speed"].to_numpy(dtype=float)[keep]
+    la = pitches["launch_angle"].to_numpy(dtype=float)[keep]
+    daily = {
+        "bbe": np.bincount(flat, minlength=size),
+        "ev": np.bincount(flat, weights=ls, minlength=size),
+        "hard": np.bincount(flat, weights=ls >= HARD_HIT_EV, minlength=size),
+        "barrel": np.bincount(flat, weights=_barrels(pitches)[keep], minlength=size),
+        "fb": np.bincount(flat, weights=la >= FB_ANGLE, minlength=size),
+    }
+    # prefix sums along the date axis, with a leading zero column
+    prefix = {
+        k: np.concatenate([np.zeros((len(batters), 1)), np.cumsum(v.reshape(len(batters), span), axis=1)], axis=1)
+        for k, v in daily.items()
+    }
+
+    frames = []
+    for w in windows:
+        total = {k: p[:, span] - p[:, span - w] for k, p in prefix.items()}
+        bbe = total["bbe"]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            frames.append(pd.DataFrame({
+                "batter": batters,
+                "window": w,
+                "BBE": bbe.astype("int64"),
+                "EV": total["ev"] / bbe,
+                "HardHit %": 100 * total["hard"] / bbe,
+                "Barrel %": 100 * total["barrel"] / bbe,
+                "FB %": 100 * total["fb"] / bbe,
+            }))
+    return pd.concat(frames, ignore_index=True)[columns]
+
+def window_stats(form, window):
+    """One window of an aggregate_recent_form result, indexed by batter id."""
+    return form[form["window"] == window].set_index("batter")
@@ -0,0 +1,182 @@
+"""Refresh the Savant leaderboard CSVs in place.
+
+Every leaderboard is fetched in parallel through one pooled session. Each
+response is checked against the columns data_store reads and then diffed
+against the checked-in CSV. Only tables whose contents changed are
+rewritten, through a temp file in the same directory and os.replace, so
+a running app sees either the old file or the new one and never a partial
+write. data_store picks the new file up by its mtime, and the feature
+tables rebuild on their next use.
+
+Point SAVANT_BASE_URL at a local stand-in to run it offline.
+
+Usage: python3 refresh_savant.py [--year 2025] [--tables exit_batters,...] [--dry-run]
+                                 [--workers 5] [--compile]
+"""
+import argparse
+import io
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import NamedTuple
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import data_store
+from instrumentation import count, timed
+
+BASE_URL = os.environ.get("SAVANT_BASE_URL", "https://baseballsavant.mlb.com")
+TIMEOUT = (3.05, 30)  # connect, read
+MAX_WORKERS = 5
+MIN_ROWS = 50  # a qualified-hitter leaderboard shorter than this is a truncated download
+
+# table -> (leaderboard path, query params besides year / csv)
+LEADERBOARDS = {
+    "exit_batters": ("leaderboard/statcast", {"type": "batter", "min": "q"}),
+    "exit_pitchers": ("leaderboard/statcast", {"type": "pitcher", "min": "q"}),
+    "expected_batters": ("leaderboard/expected_statistics", {"type": "batter", "min": "q"}),
+    "expected_pitchers": ("leaderboard/expected_statistics", {"type": "pitcher", "min": "q"}),
+    "batted_ball": ("leaderboard/batted-ball", {"type": "batter", "min": "q"}),
+}
+
+
+class SchemaError(ValueError):
+    pass
+
+
+class RefreshResult(NamedTuple):
+    table: str
+    status: str  # "updated", "unchanged", "invalid" or "failed"
+    rows: int
+    detail: str  # diff summary, or what went wrong
+
+
+def _make_session(max_workers=MAX_WORKERS):
+    session = requests.Session()
+    retry = Retry(total=2, backoff_factor=0.5, status_forcelist=(429, 502, 503, 504), allowed_methods=("GET",))
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["User-Agent"] = "Mozilla/5.0"
+    return session
+
+def leaderboard_request(table, year, base_url=BASE_URL):
+    """(url, params) for one table's CSV export."""
+    path, params = LEADERBOARDS[table]
+    return f"{base_url.rstrip('/')}/{path}", {**params, "year": year, "csv": "true"}
+
+def _key_column(table):
+    return "id" if table == "batted_ball" else "player_id"
+
+def validate(table, body):
+    """Parse a downloaded CSV, raising SchemaError unless it has every column data_store reads."""
+    try:
+        frame = pd.read_csv(io.BytesIO(body))
+    except (ValueError, UnicodeDecodeError) as e:
+        raise SchemaError(f"not a CSV: {e}") from None
+    required = data_store.TABLES[table][1] or []
+    missing = [column for column in required if column not in frame.columns]
+    if missing:
+        raise SchemaError(f"missing columns {missing}")
+    key = _key_column(table)
+    ids = pd.to_numeric(frame[key], errors="coerce")
+    if ids.isna().any() or ids.duplicated().any():
+        raise SchemaError(f"{key} has blank, non-numeric or duplicate values")
+    if len(frame) < MIN_ROWS:
+        raise SchemaError(f"only {len(frame)} rows")
+    return frame
+
+def diff(table, old, new):
+    """One-line summary of added / removed / changed players between two versions of a table."""
+    key = _key_column(table)
+    old, new = old.set_index(key), new.set_index(key)
+    added = new.index.difference(old.index)
+    removed = old.index.difference(new.index)
+    common = new.index.intersection(old.index)
+    columns = new.columns.intersection(old.columns)
+    before, after = old.loc[common, columns], new.loc[common, columns]
+    changed = (before.ne(after) & ~(before.isna() & after.isna())).any(axis=1).sum()
+    return f"+{len(added)} -{len(removed)} ~{changed} players"
+
+def swap(path, body):
+    """Replace `path` atomically: readers see the old file or the new one, never a partial write."""
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        tmp.write_bytes(body)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+def _fetch(session, table, year, base_url, timeout):
+    url, params = leaderboard_request(table, year, base_url)
+    with timed("savant_fetch", table=table):
+        response = session.get(url, params=params, timeout=timeout)
+    count("savant_requests", table=table, status=response.status_code)
+    response.raise_for_status()
+    count("savant_bytes", len(response.content), table=table)
+    return response.content
+
+def refresh_table(session, table, year, base_url=BASE_URL, timeout=TIMEOUT, dry_run=False):
+    """Fetch, validate and (if it changed) swap in one table; never raises."""
+    path = data_store.DATA_DIR / data_store.TABLES[table][0]
+    try:
+        body = _fetch(session, table, year, base_url, timeout)
+    except requests.RequestException as e:
+        count("savant_errors", table=table)
+        return RefreshResult(table, "failed", 0, str(e))
+    try:
+        new = validate(table, body)
+    except SchemaError as e:
+        return RefreshResult(table, "invalid", 0, str(e))
+
+    old = pd.read_csv(path) if path.exists() else None
+    if old is not None and (path.read_bytes() == body or old.equals(new)):
+        return RefreshResult(table, "unchanged", len(new), "")
+    detail = diff(table, old, new) if old is not None else "new file"
+    if not dry_run:
+        swap(path, body)
+    return RefreshResult(table, "updated", len(new), detail)
+
+def refresh(year=None, tables=None, base_url=BASE_URL, session=None, max_workers=MAX_WORKERS,
+            timeout=TIMEOUT, dry_run=False):
+    """Refresh every leaderboard (or just `tables`) concurrently; returns a RefreshResult per table."""
+    year = year or datetime.now().year
+    session = session or _make_session(max_workers)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(lambda table: refresh_table(session, table, year, base_url, timeout, dry_run),
+                             tables or list(LEADERBOARDS)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Refresh the Savant leaderboard CSVs.")
+    parser.add_argument("--year", type=int, default=datetime.now().year)
+    parser.add_argument("--tables", help="comma-separated subset of " + ",".join(LEADERBOARDS))
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS)
+    parser.add_argument("--dry-run", action="store_true", help="validate and diff, but write nothing")
+    parser.add_argument("--compile", action="store_true",
+                        help="recompile the Arrow snapshot and feature tables for updated CSVs")
+    args = parser.parse_args()
+
+    tables = [t.strip() for t in args.tables.split(",")] if args.tables else None
+    unknown = set(tables or []) - set(LEADERBOARDS)
+    if unknown:
+        parser.error(f"unknown tables: {', '.join(sorted(unknown))}")
+
+    results = refresh(args.year, tables, max_workers=args.workers, dry_run=args.dry_run)
+    for result in results:
+        print(f"{result.table:<18} {result.status:<10} {result.rows:>5} rows  {result.detail}")
+
+    updated = [r.table for r in results if r.status == "updated"]
+    if args.compile and updated and not args.dry_run:
+        import features
+        data_store.compile_snapshot(updated)
+        features.materialize()
+        print(f"Recompiled {', '.join(updated)}")
+    if any(r.status in ("failed", "invalid") for r in results):
+        raise SystemExit(1)
@@ -0,0 +1,85 @@
+"""Weighted hitter scoring shared by every tab and the slate mode.
+
+Stats live on very different scales (EV ~90, Barrel % ~10, xSLG ~0.4), so
+each column is normalized before weighting. Scoring is split in two steps:
+prepare() normalizes a player x stat matrix once, and apply_weights() is a
+single matrix-vector product, so changing weights never refetches or
+renormalizes anything.
+"""
+import warnings
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from instrumentation import timed
+
+NORMALIZATIONS = ("zscore", "percentile", "raw")
+NAN_POLICIES = ("drop", "mean", "min", "zero")
+
+
+class Prepared(NamedTuple):
+    index: pd.Index     # row labels of the source frame
+    matrix: np.ndarray  # normalized player x stat values, NaNs already filled
+    keep: np.ndarray    # False for rows removed by the "drop" policy
+
+
+def normalize(values, method="zscore"):
+    """Column-wise normalization of a float matrix, ignoring NaNs.
+
+    zscore: (x - mean) / std; percentile: average rank as a 0-100
+    percentile; raw: unchanged. Constant columns normalize to 0.
+    """
+    values = np.asarray(values, dtype=float)
+    if method == "raw":
+        return values.copy()
+    if method == "zscore":
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)  # empty or all-NaN columns
+            mean = np.nanmean(values, axis=0)
+            std = np.nanstd(values, axis=0)
+        z = (values - mean) / np.where(std > 0, std, 1.0)
+        return np.where(std > 0, z, np.where(np.isnan(values), np.nan, 0.0))
+    if method == "percentile":
+        return 100 * pd.DataFrame(values).rank(pct=True).to_numpy(dtype=float)
+    raise ValueError(f"unknown normalization {method!r}; expected one of {NORMALIZATIONS}")
+
+def fill_missing(matrix, policy="drop"):
+    """Apply a NaN policy to a normalized matrix; returns (filled matrix, keep mask).
+
+    drop: rows with any NaN are excluded; mean / min: NaNs take the column
+    mean / minimum; zero: NaNs become 0 (the column mean under z-scores).
+    """
+    missing = np.isnan(matrix)
+    keep = np.ones(len(matrix), dtype=bool)
+    if policy == "drop":
+        keep = ~missing.any(axis=1)
+        return np.where(missing, 0.0, matrix), keep
+    if policy == "zero":
+        fill = np.zeros(matrix.shape[1])
+    elif policy in ("mean", "min"):
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN columns
+            fill = np.nanmean(matrix, axis=0) if policy == "mean" else np.nanmin(matrix, axis=0)
+        fill = np.nan_to_num(fill)
+    else:
+        raise ValueError(f"unknown NaN policy {policy!r}; expected one of {NAN_POLICIES}")
+    return np.where(missing, fill, matrix), keep
+
+def prepare(frame, stats, method="zscore", nan_policy="drop"):
+    """Normalize the selected stat columns of a frame once, ready for any weight vector."""
+    values = frame[list(stats)].to_numpy(dtype=float)
+    matrix, keep = fill_missing(normalize(values, method), nan_policy)
+    return Prepared(frame.index, matrix, keep)
+
+def apply_weights(prepared, weights):
+    """Scores for every kept row as one matrix-vector product (NaN for dropped rows)."""
+    scores = prepared.matrix @ np.asarray(weights, dtype=float)
+    return pd.Series(np.where(prepared.keep, scores, np.nan), index=prepared.index, name="Score")
+
+@timed("scoring")
+def rank_frame(frame, stats, weights, method="zscore", nan_policy="drop"):
+    """Return `frame` with a Score column, best first, without rows dropped by the NaN policy."""
+    scores = apply_weights(prepare(frame, stats, method, nan_policy), weights)
+    ranked = frame.assign(Score=scores)
+    return ranked[scores.notna()].sort_values("Score", ascending=False, kind="stable")
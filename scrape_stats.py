@@ -1,53 +1,56 @@
-from get_lineups import get_players_and_pitchers
+from get_lineups import get_lineup
+from typing import NamedTuple
 import pandas as pd
 import numpy as np
-import re
+import data_store
+from data_store import clean_name
+from instrumentation import timed
+
+# Numeric stat columns carried by the batter / pitcher frames
+BATTER_STATS = ["EV", "Barrel %", "xSLG", "PullAir %", "OppoAir %", "FB %"]
+PITCHER_STATS = ["Hard-Hit %", "Barrel % Allowed", "xSLG Allowed", "xwOBA Allowed"]
+# batter column -> opposing pitcher stat, plus the platoon flag; see lineup_features
+OPPONENT_STATS = {
+    "Opp Hard-Hit %": "Hard-Hit %",
+    "Opp Barrel %": "Barrel % Allowed",
+    "Opp xSLG": "xSLG Allowed",
+    "Opp xwOBA": "xwOBA Allowed",
+}
+MATCHUP_STATS = list(OPPONENT_STATS) + ["Platoon Adv"]
+
+
+class StatFrames(NamedTuple):
+    """Typed result of a matchup scrape.
+
+    ``batters`` / ``pitchers`` hold a ``Name`` column plus float64 stat
+    columns.
+    """
+    batters: pd.DataFrame
+    pitchers: pd.DataFrame
+
+
+# stat column -> (source table, source column, default when the player is not in the table)
+BATTER_SOURCES = {
+    "EV": ("exit_batters", "avg_hit_speed", 87.0),
+    "Barrel %": ("exit_batters", "brl_percent", 3.0),
+    "xSLG": ("expected_batters", "est_slg", 0.34),
+    "PullAir %": ("batted_ball", "pull_air_rate", np.nan),
+    "OppoAir %": ("batted_ball", "oppo_air_rate", np.nan),
+    "FB %": ("batted_ball", "fb_rate", np.nan),
+}
+# expected_pitchers.csv has no ev95percent column; both stats live in the exit-velo table
+PITCHER_SOURCES = {
+    "Hard-Hit %": ("exit_pitchers", "ev95percent", 40.0),
+    "Barrel % Allowed": ("exit_pitchers", "brl_percent", 6.0),
+    "xSLG Allowed": ("expected_pitchers", "est_slg", 0.40),
+    "xwOBA Allowed": ("expected_pitchers", "est_woba", 0.32),
+}
 
-def clean_name(name):
-    return re.sub(r"[^\w\s]", "", name).lower().strip()
 
 def load_csvs():
-    expected_batters = pd.read_csv("expected_batters.csv")
-    exit_batters = pd.read_csv("exit_batters.csv")
-    expected_pitchers = pd.read_csv("expected_pitchers.csv")
-    exit_pitchers = pd.read_csv("exit_pitchers.csv")
-    batted_ball = pd.read_csv("batted_ball.csv")
-
-    batted_ball['name_clean'] = batted_ball['name'].apply(clean_name)
-    return expected_batters, exit_batters, expected_pitchers, exit_pitchers, batted_ball
-
-def run_scrape(team1, team2):
-    expected_batters, exit_batters, expected_pitchers, exit_pitchers, batted_ball = load_csvs()
-
-    team_names = [team1.strip().upper(), team2.strip().upper()]
-    batter_rows = exit_batters[exit_batters["Team"].isin(team_names)]
-    pitcher_rows = exit_pitchers[exit_pitchers["Team"].isin(team_names)]
-
-    print("Batter Stats:")
-    for _, row in batter_rows.iterrows():
-        name = row["Name"]
-        ev_row = expected_batters[expected_batters["Name"] == name]
-        xSLG = float(ev_row["xSLG"]) if not ev_row.empty else "n/a"
-        barrel = float(ev_row["Barrel %"]) if not ev_row.empty else "n/a"
-
-        batted_row = batted_ball[batted_ball["name_clean"] == clean_name(name)]
-        pull_air = float(batted_row["pull_air_rate"]) if not batted_row.empty else "n/a"
-        oppo_air = float(batted_row["oppo_air_rate"]) if not batted_row.empty else "n/a"
-        fb = float(batted_row["fb_rate"]) if not batted_row.empty else "n/a"
-
-        EV = row["EV"]
-        print(f"{name} | EV: {EV} | Barrel %: {barrel} | xSLG: {xSLG} | PullAir %: {pull_air} | OppoAir %: {oppo_air} | FB %: {fb}")
-
-    print("\nPitcher Stats:")
-    for _, row in pitcher_rows.iterrows():
-        name = row["Name"]
-        ev_row = expected_pitchers[expected_pitchers["Name"] == name]
-        barrel_allowed = float(ev_row["Barrel %"]) if not ev_row.empty else "n/a"
-        hh = float(ev_row["HardHit %"]) if not ev_row.empty else "n/a"
-        print(f"{name} | Hard-Hit %: {hh} | Barrel % Allowed: {barrel_allowed}")
-
-def clean_name(name):
-    return re.sub(r"[^\w\s]", "", name).lower().strip()
+    # Shared per-process copies, re-read only when a CSV changes on disk
+    return tuple(data_store.get(name) for name in (
+        "expected_batters", "exit_batters", "expected_pitchers", "exit_pitchers", "batted_ball"))
 
 def format_to_last_first(name):
     parts = name.strip().split()
@@ -57,82 +60,178 @@ def format_to_last_first(name):
     last = " ".join(parts[1:])
     return f"{last}, {first}"
 
-def get_batter_stats(name, exit_batters, expected_batters, batted_ball):
-    last_first = format_to_last_first(name)
-    if not last_first:
-        return {
-            "Name": name,
-            "EV": "n/a",
-            "Barrel %": "n/a",
-            "xSLG": "n/a",
-            "PullAir %": "n/a",
-            "OppoAir %": "n/a",
-            "FB %": "n/a"
-        }
-
-    ev_row = exit_batters[exit_batters['last_name, first_name'].str.lower() == last_first.lower()]
-    exp_row = expected_batters[expected_batters['last_name, first_name'].str.lower() == last_first.lower()]
-    cleaned_last_first = clean_name(last_first)
-    ball_row = batted_ball[batted_ball['name_clean'] == cleaned_last_first]
-
-    ev = ev_row.iloc[0]['avg_hit_speed'] if not ev_row.empty else 87.0
-    barrel = ev_row.iloc[0]['brl_percent'] if not ev_row.empty else 3.0
-    xslg = exp_row.iloc[0]['est_slg'] if not exp_row.empty else 0.34
-    pull_air = ball_row.iloc[0]['pull_air_rate'] if not ball_row.empty else "n/a"
-    oppo_air = ball_row.iloc[0]['oppo_air_rate'] if not ball_row.empty else "n/a"
-    fb_rate = ball_row.iloc[0]['fb_rate'] if not ball_row.empty else "n/a"
-
-    return {
-        "Name": name,
-        "EV": ev,
-        "Barrel %": barrel,
-        "xSLG": xslg,
-        "PullAir %": pull_air,
-        "OppoAir %": oppo_air,
-        "FB %": fb_rate
-    }
-
-def get_pitcher_stats(name, exit_pitchers, expected_pitchers):
+def lineup_key(name):
+    """Full name -> the clean "last first" key used by the Savant tables (None if unusable)."""
     last_first = format_to_last_first(name)
-    if not last_first:
-        return {
-            "Name": name,
-            "Hard-Hit %": "n/a",
-            "Barrel % Allowed": "n/a"
-        }
-
-    ev_row = expected_pitchers[expected_pitchers['last_name, first_name'].str.lower() == last_first.lower()]
-    exit_row = exit_pitchers[exit_pitchers['last_name, first_name'].str.lower() == last_first.lower()]
-
-    hh = ev_row.iloc[0]['ev95percent'] if not ev_row.empty else 40.0
-    brl_allowed = exit_row.iloc[0]['brl_percent'] if not exit_row.empty else 6.0
+    return clean_name(last_first) if last_first else None
+
+def _first_positions(values, lookups):
+    """Row position of the first entry in `values` equal to each lookup, -1 where absent."""
+    values = pd.Index(values)
+    first = ~values.duplicated()
+    pos = values[first].get_indexer(lookups)
+    return np.where(pos >= 0, np.flatnonzero(first)[pos], -1)
+
+def _row_positions(table, keys, player_ids=None):
+    """Resolve each player to a row of `table`, by player_id when known and by name key otherwise."""
+    pos = _first_positions(table['name_key'], keys)
+    if player_ids is not None:
+        ids = pd.to_numeric(pd.Series(player_ids, dtype=object), errors="coerce").to_numpy()
+        by_id = _first_positions(table['player_id'], ids)
+        pos = np.where(by_id >= 0, by_id, pos)
+    return pos
+
+def _stat_frames(names, tables, sources, player_ids=None):
+    """Vectorized join of a list of players against the stat tables described by `sources`."""
+    names = list(names)
+    keys = [lineup_key(n) for n in names]
+    has_key = np.array([k is not None for k in keys], dtype=bool)
+
+    positions = {}
+    for table_name, _, _ in sources.values():
+        if table_name not in positions:
+            positions[table_name] = _row_positions(tables[table_name], keys, player_ids)
+
+    stats = pd.DataFrame({"Name": pd.Series(names, dtype=object)})
+    for stat, (table_name, column, default) in sources.items():
+        pos = positions[table_name]
+        found = pos >= 0
+        # position -1 picks the appended default
+        values = np.append(tables[table_name][column].to_numpy(dtype=float), default)[pos]
+        # names that can't be split into first/last were never looked up
+        stats[stat] = np.where(found | has_key, values, np.nan)
+    return stats
+
+def _tables(exit_batters=None, expected_batters=None, batted_ball=None, exit_pitchers=None, expected_pitchers=None):
     return {
-        "Name": name,
-        "Hard-Hit %": hh,
-        "Barrel % Allowed": brl_allowed
+        "exit_batters": exit_batters, "expected_batters": expected_batters, "batted_ball": batted_ball,
+        "exit_pitchers": exit_pitchers, "expected_pitchers": expected_pitchers,
     }
 
-def run_scrape(team1, team2):
-    expected_batters, exit_batters, expected_pitchers, exit_pitchers, batted_ball = load_csvs()
-    lineup_data = get_players_and_pitchers(team1, team2)
-    if not lineup_data:
-        return f"Error: No {team1.upper()} vs {team2.upper()} matchup today or lineups unavailable."
+def batter_frames(names, exit_batters, expected_batters, batted_ball, player_ids=None):
+    """Stats frame for a whole lineup in one pass over each table."""
+    tables = _tables(exit_batters=exit_batters, expected_batters=expected_batters, batted_ball=batted_ball)
+    return _stat_frames(names, tables, BATTER_SOURCES, player_ids)
 
-    batters, pitchers = lineup_data
+def pitcher_frames(names, exit_pitchers, expected_pitchers, player_ids=None):
+    """Stats frame for a list of pitchers in one pass over each table."""
+    tables = _tables(exit_pitchers=exit_pitchers, expected_pitchers=expected_pitchers)
+    return _stat_frames(names, tables, PITCHER_SOURCES, player_ids)
 
+@timed("stat_join")
+def lineup_frames(batters, pitchers, batter_ids=None, pitcher_ids=None):
+    """Join already-fetched lineups against the Savant CSVs and return StatFrames."""
+    expected_batters, exit_batters, expected_pitchers, exit_pitchers, batted_ball = load_csvs()
+    return StatFrames(batter_frames(batters, exit_batters, expected_batters, batted_ball, batter_ids),
+                      pitcher_frames(pitchers, exit_pitchers, expected_pitchers, pitcher_ids))
+
+def scrape_frames(team1, team2):
+    """Join today's lineups for a matchup against the Savant CSVs and return StatFrames."""
+    lineup = get_lineup(team1, team2)
+    return lineup_frames([b.name for b in lineup.batters], [p.name for p in lineup.pitchers],
+                         [b.id for b in lineup.batters], [p.id for p in lineup.pitchers])
+
+def batting_sides(names, handedness, player_ids=None):
+    """Batting side per player: handedness.csv by name, then player_id_map.csv BATS by MLBAM id, default R."""
+    side = pd.Series(list(names), dtype=object).str.lower().str.strip().map(handedness)
+    if player_ids is not None:
+        bats = data_store.bats_throws_by_id()["BATS"].replace("B", "S")
+        side = side.fillna(pd.Series(bats.reindex(pd.array(list(player_ids), dtype="Int64")).to_numpy()))
+    return side.fillna("R").to_numpy()
+
+def wind_carry(home_teams, weather, sides, pull_air, oppo_air):
+    """Wind speed (mph) along each batter's air-ball directions at their home park.
+
+    `weather` is the weather.get_weather() table. The wind's direction
+    comes from its field-relative wind_dir text ("Out to RF", "In from LF",
+    "L to R"; see weather.field_direction). The pull and oppo fields sit 45
+    degrees either side of center. The two wind components are averaged
+    with the batter's PullAir % / OppoAir % as weights; switch hitters get
+    both fields equally. Positive means the wind carries the batter's fly
+    balls out. Domes and calm air are 0. Parks with no weather row, or a
+    direction that can't be read, are NaN.
+    """
+    from weather import FIELD_ANGLES, field_direction
+
+    parks = weather.dropna(subset=["team"]).drop_duplicates("team").set_index("team")
+    pos = parks.index.get_indexer(list(home_teams))
+    speed = np.append(parks["wind_speed"].to_numpy(dtype=float), np.nan)[pos]
+    toward = np.append([field_direction(text) for text in parks["wind_dir"]], np.nan)[pos]
+    dome = np.append(parks["dome"].to_numpy(dtype=bool), False)[pos]
+
+    def along(field):
+        return speed * np.cos(np.radians(toward - FIELD_ANGLES[field]))
+
+    left, right = along("lf"), along("rf")
+    sides = np.asarray(sides)
+    pull = np.where(sides == "L", right, left)
+    oppo = np.where(sides == "L", left, right)
+    switch = sides == "S"
+    pull = np.where(switch, (left + right) / 2, pull)
+    oppo = np.where(switch, (left + right) / 2, oppo)
+
+    pull_w = np.asarray(pull_air, dtype=float)
+    oppo_w = np.asarray(oppo_air, dtype=float)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        carry = (pull_w * pull + oppo_w * oppo) / (pull_w + oppo_w)
+    return np.where(dome | (speed == 0), 0.0, carry)
+
+def hand_column(column, names, player_ids=None):
+    """BATS or THROWS per player from player_id_map.csv: by MLBAM id when known, by name otherwise."""
+    by_name = data_store.bats_throws()[column].reindex([clean_name(n) for n in names]).to_numpy()
+    if player_ids is None:
+        return by_name
+    by_id = data_store.bats_throws_by_id()[column].reindex(pd.array(list(player_ids), dtype="Int64")).to_numpy()
+    return np.where(pd.notna(by_id), by_id, by_name)
+
+def platoon_edge(bats, throws):
+    """Platoon Adv: 1.0 opposite-side (switch hitters always), 0.0 same-side, NaN if either hand is unknown."""
+    known = pd.notna(bats) & pd.notna(throws)
+    # blank out unknown hands first: pd.NA (Arrow-backed strings) can't be compared
+    bats, throws = np.where(known, bats, ""), np.where(known, throws, "")
+    edge = np.isin(bats, ["B", "S"]) | (bats != throws)
+    return np.where(known, edge, np.nan)
+
+@timed("feature_join")
+def lineup_features(batters, opponents, home_teams, weather):
+    """Season, matchup and wind features for LineupPlayer records (see get_lineups.Lineup).
+
+    `opponents` is the opposing probable pitcher for each batter. Rows come
+    from the MLBID-keyed tables in features.py; only players missing there
+    (no id, or no Savant row) are joined by name.
+    """
+    import features
+
+    ids = [b.id for b in batters]
+    rows = features.batter_rows([b.name for b in batters], ids)
+    opp = features.pitcher_rows([o.name for o in opponents], [o.id for o in opponents])
+    out = rows[["Name"] + BATTER_STATS + ["RightFly", "LeftFly"]]
+    out.insert(1, "player_id", pd.array(ids, dtype="Int64"))
+    out["Opp Pitcher"] = opp["Name"].to_numpy()
+    for column, stat in OPPONENT_STATS.items():
+        out[column] = opp[stat].to_numpy(dtype=float)
+    out["Platoon Adv"] = platoon_edge(rows["BATS"].to_numpy(), opp["THROWS"].to_numpy())
+    out["Wind Carry"] = wind_carry(home_teams, weather, rows["Side"].to_numpy(), rows["PullAir %"], rows["OppoAir %"])
+    return out
+
+def _fmt(value):
+    return "n/a" if pd.isna(value) else value
+
+def render_report(frames):
+    """Render StatFrames as the plain-text "Batter Stats / Pitcher Stats" report."""
     output = "Batter Stats:\n"
-    for name in batters:
-        stats = get_batter_stats(name, exit_batters, expected_batters, batted_ball)
+    for _, row in frames.batters.iterrows():
+        ev, barrel, xslg, pull_air, oppo_air, fb = (_fmt(row[stat]) for stat in BATTER_STATS)
         output += (
-            f"{stats['Name']} | EV: {stats['EV']} | Barrel %: {stats['Barrel %']} | xSLG: {stats['xSLG']} | "
-            f"PullAir %: {stats['PullAir %']} | OppoAir %: {stats['OppoAir %']} | FB %: {stats['FB %']}\n"
+            f"{row['Name']} | EV: {ev} | Barrel %: {barrel} | xSLG: {xslg} | "
+            f"PullAir %: {pull_air} | OppoAir %: {oppo_air} | FB %: {fb}\n"
         )
 
     output += "\nPitcher Stats:\n"
-    for name in pitchers:
-        stats = get_pitcher_stats(name, exit_pitchers, expected_pitchers)
-        output += (
-            f"{stats['Name']} | Hard-Hit %: {stats['Hard-Hit %']} | Barrel % Allowed: {stats['Barrel % Allowed']}\n"
-        )
+    for _, row in frames.pitchers.iterrows():
+        output += f"{row['Name']} | " + " | ".join(f"{stat}: {_fmt(row[stat])}" for stat in PITCHER_STATS) + "\n"
 
     return output
+
+def run_scrape(team1, team2):
+    return render_report(scrape_frames(team1, team2))
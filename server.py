@@ -0,0 +1,187 @@
+"""Headless JSON API over the ranking pipeline.
+
+Every request runs the blocking pipeline call on a shared thread pool, so
+one slow lineup or Statcast pull never stalls other clients, and all of
+them share the process's warm caches (reference tables, StatsAPI
+responses, weather, feature frames).
+
+Endpoints (GET):
+    /matchups?date=YYYY-MM-DD
+    /rank/season?matchup=NYY@BOS&stats=EV,Barrel %&weights=0.5,0.5[&normalize=zscore&nan_policy=drop]
+    /rank/recent?matchup=NYY@BOS&window=11[&weights=...&stats=...]
+    /rank/slate?stats=...&weights=...[&date=YYYY-MM-DD]
+    /weather?matchup=NYY@BOS
+    /metrics  (Prometheus text)
+
+Usage: python3 server.py [--port 8000] [--workers 8]
+"""
+import argparse
+import asyncio
+import json
+import math
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pandas as pd
+import tornado.web
+
+import instrumentation
+import pipeline
+from get_lineups import TEAM_NAME_MAP, TEAM_NAME_ALIASES
+from recent_form import WINDOWS
+from scoring import NORMALIZATIONS, NAN_POLICIES
+
+MAX_WORKERS = 8
+TEAMS = sorted(set(TEAM_NAME_MAP) | set(TEAM_NAME_ALIASES))
+
+
+def bad_request(message):
+    """A 400 whose message is sent to the client (and logged as a warning, not a traceback)."""
+    return tornado.web.HTTPError(400, "%s", message)
+
+
+class ApiHandler(tornado.web.RequestHandler):
+    def initialize(self, pool):
+        self.pool = pool
+
+    async def run(self, fn, *args):
+        """Run a blocking pipeline call on the shared pool."""
+        return await asyncio.get_running_loop().run_in_executor(self.pool, fn, *args)
+
+    def send_json(self, payload):
+        self.set_header("Content-Type", "application/json")
+        self.finish(payload if isinstance(payload, str) else json.dumps(payload, default=str, allow_nan=False))
+
+    def send_frame(self, frame):
+        self.send_json('{"rows": ' + frame.to_json(orient="records") + "}")
+
+    def matchup(self):
+        """(away, home) abbreviations from ?matchup=AWAY@HOME."""
+        matchup = self.get_argument("matchup")
+        if matchup.count("@") != 1:
+            raise bad_request("matchup must look like NYY@BOS")
+        teams = pipeline.split_matchup(matchup)
+        unknown = [team for team in teams if team not in TEAMS]
+        if unknown:
+            raise bad_request(f"unknown team {unknown[0]!r}; expected one of {TEAMS}")
+        return teams
+
+    def date(self):
+        date = self.get_argument("date", None)
+        if date is not None:
+            try:
+                datetime.strptime(date, "%Y-%m-%d")
+            except ValueError:
+                raise bad_request("date must be YYYY-MM-DD") from None
+        return date
+
+    def window(self):
+        try:
+            window = int(self.get_argument("window", "11"))
+        except ValueError:
+            window = None
+        if window not in WINDOWS:
+            raise bad_request(f"window must be one of {WINDOWS}")
+        return window
+
+    def scoring_args(self, available, default_stats, default_weights):
+        stats = [s.strip() for s in self.get_argument("stats", ",".join(default_stats)).split(",")]
+        unknown = [stat for stat in stats if stat not in available]
+        if unknown:
+            raise bad_request(f"unknown stat {unknown[0]!r}; expected one of {available}")
+        try:
+            weights = [float(w) for w in self.get_argument("weights", ",".join(map(str, default_weights))).split(",")]
+        except ValueError:
+            raise bad_request("weights must be comma-separated numbers") from None
+        if not all(math.isfinite(w) for w in weights):
+            raise bad_request("weights must be finite")
+        if len(stats) != len(weights):
+            raise bad_request("stats and weights must have the same length")
+        method = self.get_argument("normalize", "zscore")
+        nan_policy = self.get_argument("nan_policy", "drop")
+        if method not in NORMALIZATIONS or nan_policy not in NAN_POLICIES:
+            raise bad_request(f"normalize must be one of {NORMALIZATIONS}, nan_policy one of {NAN_POLICIES}")
+        return stats, weights, method, nan_policy
+
+    def write_error(self, status_code, **kwargs):
+        exc = kwargs.get("exc_info", (None, None, None))[1]
+        # only 4xx messages are the client's business; anything else is logged and reported generically
+        if isinstance(exc, tornado.web.HTTPError) and exc.log_message and status_code < 500:
+            message = exc.log_message % exc.args
+        else:
+            message = self._reason
+        self.finish({"error": message})
+
+
+class MatchupsHandler(ApiHandler):
+    async def get(self):
+        self.send_json({"matchups": await self.run(pipeline.matchups, self.date())})
+
+
+class SeasonHandler(ApiHandler):
+    async def get(self):
+        team1, team2 = self.matchup()
+        stats, weights, method, nan_policy = self.scoring_args(pipeline.SEASON_STATS, ["EV", "Barrel %"], [0.5, 0.5])
+        batters = await self.run(pipeline.season_features, team1, team2)
+        self.send_frame(await self.run(pipeline.rank_season, batters, stats, weights, method, nan_policy))
+
+
+class RecentHandler(ApiHandler):
+    async def get(self):
+        team1, team2 = self.matchup()
+        window = self.window()
+        stats, weights, method, nan_policy = self.scoring_args(pipeline.RECENT_STATS, pipeline.RECENT_STATS,
+                                                               [0.33, 0.33, 0.34, 0.0])
+        recent = await self.run(pipeline.recent_features, team1, team2)
+        ranked = await self.run(pipeline.rank_recent, recent, window, weights, stats, method, nan_policy)
+        failed = json.dumps(recent.failed)
+        self.send_json('{"rows": ' + ranked.to_json(orient="records") + ', "failed": ' + failed + "}")
+
+
+class SlateHandler(ApiHandler):
+    async def get(self):
+        stats, weights, method, nan_policy = self.scoring_args(pipeline.SEASON_STATS, ["EV", "Barrel %"], [0.5, 0.5])
+        date = self.date()
+        self.send_frame(await self.run(pipeline.rank_slate, stats, weights, date, method, nan_policy))
+
+
+class WeatherHandler(ApiHandler):
+    async def get(self):
+        team1, team2 = self.matchup()
+        self.send_json({"weather": await self.run(pipeline.weather_for, team1, team2)})
+
+
+class MetricsHandler(tornado.web.RequestHandler):
+    def get(self):
+        self.set_header("Content-Type", "text/plain; version=0.0.4")
+        self.finish(instrumentation.to_prometheus())
+
+
+def make_app(max_workers=MAX_WORKERS):
+    pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pipeline")
+    args = {"pool": pool}
+    return tornado.web.Application([
+        (r"/matchups", MatchupsHandler, args),
+        (r"/rank/season", SeasonHandler, args),
+        (r"/rank/recent", RecentHandler, args),
+        (r"/rank/slate", SlateHandler, args),
+        (r"/weather", WeatherHandler, args),
+        (r"/metrics", MetricsHandler),
+    ])
+
+async def serve(port, max_workers):
+    pipeline.warm_up()
+    make_app(max_workers).listen(port)
+    print(f"Serving on http://127.0.0.1:{port}")
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the hitter rankings as a JSON API.")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS)
+    args = parser.parse_args()
+    # process-global, so set by the entry point: with copy-on-write the shallow
+    # copies data_store hands to concurrent requests never write through
+    pd.set_option("mode.copy_on_write", True)
+    asyncio.run(serve(args.port, args.workers))
@@ -0,0 +1,124 @@
+"""Rank every game on today's slate in one pass.
+
+The schedule is pulled once, all boxscores are fetched concurrently, and
+every batter on the slate is joined against the Savant tables in a single
+vectorized lookup.
+
+Usage: python3 slate.py [--date YYYY-MM-DD] [--stats "EV,Barrel %"] [--weights 0.5,0.5]
+                        [--normalize zscore|percentile|raw] [--nan-policy drop|mean|min|zero] [--top N]
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+import data_store
+import features
+from get_lineups import TEAM_ABBR, todays_games, lineup_records
+from scrape_stats import load_csvs, lineup_features
+from scoring import rank_frame, NORMALIZATIONS, NAN_POLICIES
+from statsapi import client, is_final
+from weather import weather_or_empty
+
+DEFAULT_STATS = ["EV", "Barrel %"]
+DEFAULT_WEIGHTS = [0.5, 0.5]
+MAX_WORKERS = 8
+
+
+class SlateResult(NamedTuple):
+    ranked: pd.DataFrame  # one row per scored batter, with Game, Score, Game Rank, Overall Rank
+    timings: dict         # stage -> seconds
+
+
+@contextmanager
+def _stage(timings, name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = time.perf_counter() - start
+
+def game_label(game):
+    away = game["teams"]["away"]["team"]["name"]
+    home = game["teams"]["home"]["team"]["name"]
+    return f"{TEAM_ABBR.get(away, away)} @ {TEAM_ABBR.get(home, home)}"
+
+def fetch_slate_lineups(date=None, max_workers=MAX_WORKERS, timings=None):
+    """Return [(game label, Lineup)] for every game, with boxscores fetched concurrently."""
+    timings = {} if timings is None else timings
+    with _stage(timings, "schedule"):
+        games = todays_games(client.schedule(date))
+
+    def fetch(game):
+        box = client.boxscore(game["gamePk"], final=is_final(game))
+        return game_label(game), lineup_records(game, box)
+
+    with _stage(timings, "boxscores"):
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(fetch, games))
+
+def slate_batters(lineups):
+    """Season, matchup and wind features for every batter in `lineups`, one row per batter with its Game label."""
+    games = [label for label, lineup in lineups for _ in lineup.batters]
+    batters = [b for _, lineup in lineups for b in lineup.batters]
+    opponents = [o for _, lineup in lineups for o in lineup.opponents]
+    home_teams = [game.split(" @ ")[1] for game in games]
+    batters = lineup_features(batters, opponents, home_teams, weather_or_empty())
+    batters.insert(0, "Game", games)
+    return batters
+
+def rank_batters(batters, stats, weights, method="zscore", nan_policy="drop"):
+    """Score slate features and add per-game and overall ranks."""
+    ranked = rank_frame(batters, list(stats), list(weights), method, nan_policy).reset_index(drop=True)
+    ranked["Game Rank"] = ranked.groupby("Game")["Score"].rank(ascending=False, method="first").astype(int)
+    ranked["Overall Rank"] = np.arange(1, len(ranked) + 1)
+    return ranked
+
+def rank_slate(stats=DEFAULT_STATS, weights=DEFAULT_WEIGHTS, date=None, max_workers=MAX_WORKERS,
+               method="zscore", nan_policy="drop"):
+    """Rank every batter on the slate, per game and overall (stats normalized across the slate)."""
+    timings = {}
+    lineups = fetch_slate_lineups(date, max_workers, timings)
+
+    with _stage(timings, "load_csvs"):
+        load_csvs()
+        data_store.handedness_map()
+        features.batters()
+        features.pitchers()
+
+    with _stage(timings, "join"):
+        batters = slate_batters(lineups)
+
+    with _stage(timings, "score"):
+        ranked = rank_batters(batters, stats, weights, method, nan_policy)
+
+    return SlateResult(ranked, timings)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rank every batter on the slate.")
+    parser.add_argument("--date", help="YYYY-MM-DD (default: today)")
+    parser.add_argument("--stats", default=",".join(DEFAULT_STATS))
+    parser.add_argument("--weights", default=",".join(str(w) for w in DEFAULT_WEIGHTS))
+    parser.add_argument("--normalize", choices=NORMALIZATIONS, default="zscore")
+    parser.add_argument("--nan-policy", choices=NAN_POLICIES, default="drop")
+    parser.add_argument("--top", type=int, default=25)
+    args = parser.parse_args()
+
+    stats = [s.strip() for s in args.stats.split(",")]
+    weights = [float(w) for w in args.weights.split(",")]
+    if len(stats) != len(weights):
+        parser.error("--stats and --weights must have the same length")
+
+    start = time.perf_counter()
+    result = rank_slate(stats, weights, date=args.date, method=args.normalize, nan_policy=args.nan_policy)
+    columns = ["Overall Rank", "Game Rank", "Game", "Name", "Score"] + stats
+    print(result.ranked[columns].head(args.top).to_string(index=False))
+    print("\nStage timings:")
+    for stage, seconds in result.timings.items():
+        print(f"  {stage:<10} {seconds * 1000:8.1f} ms")
+    print(f"  {'total':<10} {(time.perf_counter() - start) * 1000:8.1f} ms")
@@ -0,0 +1,184 @@
+"""Local, date-partitioned store of league-wide Statcast pitches.
+
+One bulk `pybaseball.statcast` pull fills the store, and each update only
+fetches the game dates it doesn't have yet. Recent-form stats for any
+matchup are then a local aggregation (recent_form.aggregate_recent_form)
+with no network calls.
+
+The pull runs outside any request, from a nightly `python statcast_store.py`.
+A long-running app or server process that finds the store behind (the
+job hasn't run yet today) tops it up once a day on a background thread.
+Writers hold a lock file in the store directory, so one process pulls
+while the others skip. Until the store covers a window, recent form is
+fetched per batter.
+
+Layout: statcast_store/game_date=YYYY-MM-DD.parquet (one file per date,
+empty files mark days without games).
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows: the in-process lock only
+    fcntl = None
+
+from instrumentation import timed
+from recent_form import WINDOWS
+
+STORE_DIR = Path(__file__).resolve().parent / "statcast_store"
+RETENTION_DAYS = max(WINDOWS)  # the longest recent-form window; older partitions are pruned
+REFRESH_INTERVAL = 3600   # seconds before the newest partition is re-pulled (Savant posts late)
+
+# pitch-level columns kept from the Statcast feed
+COLUMNS = [
+    "game_date", "game_pk", "batter", "pitcher", "stand", "p_throws", "home_team", "away_team",
+    "inning_topbot", "type", "events", "description", "bb_type",
+    "launch_speed", "launch_angle", "launch_speed_angle", "hit_distance_sc", "hc_x", "hc_y",
+]
+
+_lock = threading.Lock()
+
+
+def _as_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(str(value)[:10], "%Y-%m-%d").date()
+
+def partition_path(day):
+    return STORE_DIR / f"game_date={_as_date(day).isoformat()}.parquet"
+
+def stored_dates():
+    """Game dates that have a partition on disk."""
+    if not STORE_DIR.exists():
+        return []
+    return sorted(_as_date(p.stem.split("=", 1)[1]) for p in STORE_DIR.glob("game_date=*.parquet"))
+
+def covers(start_dt, end_dt):
+    """True if every date in [start_dt, end_dt] has a partition."""
+    start, end = _as_date(start_dt), _as_date(end_dt)
+    have = set(stored_dates())
+    return all(start + timedelta(days=i) in have for i in range((end - start).days + 1))
+
+def _default_fetch(start_dt, end_dt):
+    from pybaseball import statcast
+    with timed("pybaseball_statcast"):
+        return statcast(start_dt, end_dt, verbose=False)
+
+def _normalize(frame):
+    frame = frame.reindex(columns=COLUMNS)
+    frame["game_date"] = pd.to_datetime(frame["game_date"]).dt.normalize()
+    for col in ("launch_speed", "launch_angle", "launch_speed_angle", "hit_distance_sc", "hc_x", "hc_y"):
+        frame[col] = pd.to_numeric(frame[col], errors="coerce").astype("float64")
+    for col in ("game_pk", "batter", "pitcher"):
+        frame[col] = pd.to_numeric(frame[col], errors="coerce").astype("Int64")
+    return frame
+
+@contextmanager
+def _update_lock(blocking=True):
+    """Hold the store's writer lock, across threads and processes; yields False if busy and not blocking."""
+    if not _lock.acquire(blocking=blocking):
+        yield False
+        return
+    try:
+        STORE_DIR.mkdir(exist_ok=True)
+        with open(STORE_DIR / ".update.lock", "a") as handle:
+            if fcntl is not None:
+                try:
+                    fcntl.flock(handle, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    yield False
+                    return
+            yield True
+    finally:
+        _lock.release()
+
+def _write_partition(day, frame):
+    path = partition_path(day)
+    tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    frame.to_parquet(tmp, index=False)
+    os.replace(tmp, path)  # readers never see a half-written partition
+
+def _missing_ranges(days):
+    """Collapse a sorted list of dates into contiguous (start, end) ranges."""
+    ranges = []
+    for day in days:
+        if ranges and day - ranges[-1][1] == timedelta(days=1):
+            ranges[-1][1] = day
+        else:
+            ranges.append([day, day])
+    return ranges
+
+def last_game_date():
+    """The newest date update() stores by default: yesterday, since today's games are still being played."""
+    return date.today() - timedelta(days=1)
+
+def update(through=None, days=RETENTION_DAYS, fetch=None, blocking=True):
+    """Pull only the game dates the store is missing, up to `through` (default last_game_date()).
+
+    Returns the list of dates that were (re)written, or None when
+    `blocking` is False and another thread or process is already updating.
+    `fetch(start_dt, end_dt)` defaults to pybaseball.statcast; pass a stub
+    to run offline.
+    """
+    fetch = fetch or _default_fetch
+    through = _as_date(through or last_game_date())
+    start = through - timedelta(days=days - 1)
+
+    with _update_lock(blocking) as locked:
+        if not locked:
+            return None
+        have = set(stored_dates())
+        wanted = [start + timedelta(days=i) for i in range(days)]
+        missing = [d for d in wanted if d not in have]
+
+        # the newest stored day may have been pulled before Savant finished posting it
+        latest = max(have.intersection(wanted), default=None)
+        if latest is not None:
+            written_at = datetime.fromtimestamp(partition_path(latest).stat().st_mtime)
+            settled = written_at.date() > latest + timedelta(days=1)
+            if not settled and time.time() - written_at.timestamp() > REFRESH_INTERVAL:
+                missing = sorted(missing + [latest])
+
+        written = []
+        for range_start, range_end in _missing_ranges(missing):
+            frame = _normalize(fetch(range_start.isoformat(), range_end.isoformat()))
+            by_day = dict(tuple(frame.groupby(frame["game_date"].dt.date)))
+            day = range_start
+            while day <= range_end:
+                _write_partition(day, by_day.get(day, frame.iloc[0:0]))
+                written.append(day)
+                day += timedelta(days=1)
+
+        for day in have:
+            if day < start:
+                partition_path(day).unlink(missing_ok=True)
+    return written
+
+def load(start_dt, end_dt, batters=None, columns=None):
+    """Read the stored pitches for [start_dt, end_dt], optionally for a set of batter ids."""
+    start, end = _as_date(start_dt), _as_date(end_dt)
+    frames = []
+    for day in stored_dates():
+        if start <= day <= end:
+            frames.append(pd.read_parquet(partition_path(day), columns=columns))
+    if not frames:
+        return _normalize(pd.DataFrame(columns=COLUMNS))[columns or COLUMNS]
+    pitches = pd.concat(frames, ignore_index=True)
+    if batters is not None:
+        pitches = pitches[pitches["batter"].isin(list(batters))]
+    return pitches
+
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    written = update()
+    print(f"Wrote {len(written)} partition(s) to {STORE_DIR} in {time.perf_counter() - start:.1f}s")
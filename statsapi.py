@@ -0,0 +1,164 @@
+"""Shared MLB StatsAPI client.
+
+One pooled requests.Session with timeouts, an in-memory + on-disk response
+cache with per-endpoint TTLs, and ETag / Last-Modified revalidation. Every
+schedule and boxscore read in the project goes through `client`.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from instrumentation import count, timed
+
+BASE_URL = os.environ.get("STATSAPI_BASE_URL", "https://statsapi.mlb.com/api/v1")
+CACHE_DIR = Path(__file__).resolve().parent / ".statsapi_cache"
+TIMEOUT = (3.05, 10)  # connect, read
+
+# seconds a cached response is served without revalidation (None = forever)
+SCHEDULE_TTL = 5 * 60
+LIVE_BOXSCORE_TTL = 60
+FINAL_BOXSCORE_TTL = None
+PEOPLE_SEARCH_TTL = 24 * 60 * 60
+
+
+class StatsApiClient:
+    def __init__(self, base_url=BASE_URL, cache_dir=CACHE_DIR, timeout=TIMEOUT, session=None):
+        self.base_url = base_url.rstrip("/")
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.timeout = timeout
+        self.session = session or self._make_session()
+        self._memory = {}  # key -> cache entry dict
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _make_session():
+        session = requests.Session()
+        retry = Retry(total=2, backoff_factor=0.3, status_forcelist=(502, 503, 504), allowed_methods=("GET",))
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    # --- cache plumbing ---
+
+    def _key(self, path, params):
+        query = "&".join(f"{k}={v}" for k, v in sorted((params or {}).items()))
+        return f"{path}?{query}"
+
+    def _disk_path(self, key):
+        return self.cache_dir / (hashlib.sha1(key.encode()).hexdigest() + ".json")
+
+    def _read_entry(self, key):
+        with self._lock:
+            entry = self._memory.get(key)
+        if entry is not None or self.cache_dir is None:
+            return entry
+        try:
+            entry = json.loads(self._disk_path(key).read_text())
+        except (OSError, ValueError):
+            return None
+        with self._lock:
+            self._memory[key] = entry
+        return entry
+
+    def _write_entry(self, key, entry):
+        with self._lock:
+            self._memory[key] = entry
+        if self.cache_dir is None:
+            return
+        try:
+            self.cache_dir.mkdir(exist_ok=True)
+            path = self._disk_path(key)
+            tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_text(json.dumps(entry))
+            os.replace(tmp, path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _fresh(entry, ttl):
+        return ttl is None or time.time() - entry["fetched_at"] < ttl
+
+    def get_json(self, path, params=None, ttl=60, stale_ok=True):
+        """GET base_url + path, served from cache while younger than `ttl` seconds.
+
+        Stale entries are revalidated with If-None-Match / If-Modified-Since.
+        If the request fails and a stale copy exists, the stale copy is
+        returned, unless `stale_ok` is False, in which case the error is raised.
+        """
+        key = self._key(path, params)
+        endpoint = _endpoint(path)
+        entry = self._read_entry(key)
+        if entry is not None and self._fresh(entry, ttl):
+            count("http_cache", endpoint=endpoint, result="fresh")
+            return entry["body"]
+
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        try:
+            with timed("http_request", endpoint=endpoint):
+                response = self.session.get(self.base_url + path, params=params, headers=headers,
+                                            timeout=self.timeout)
+            count("http_requests", endpoint=endpoint, status=response.status_code)
+            if response.status_code == 304 and entry is not None:
+                count("http_cache", endpoint=endpoint, result="revalidated")
+                entry = dict(entry, fetched_at=time.time())
+                self._write_entry(key, entry)
+                return entry["body"]
+            response.raise_for_status()
+            body = response.json()
+            count("http_bytes", len(response.content or b""), endpoint=endpoint)
+        except (requests.RequestException, ValueError):
+            count("http_errors", endpoint=endpoint)
+            if entry is not None and stale_ok:
+                count("http_cache", endpoint=endpoint, result="stale")
+                return entry["body"]
+            raise
+
+        count("http_cache", endpoint=endpoint, result="miss")
+
+        self._write_entry(key, {
+            "fetched_at": time.time(),
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "body": body,
+        })
+        return body
+
+    # --- endpoints ---
+
+    def schedule(self, date=None, ttl=SCHEDULE_TTL, stale_ok=True):
+        date = date or datetime.now().strftime("%Y-%m-%d")
+        return self.get_json("/schedule", {"sportId": 1, "date": date}, ttl=ttl, stale_ok=stale_ok)
+
+    def boxscore(self, game_pk, final=False, ttl=LIVE_BOXSCORE_TTL, stale_ok=True):
+        """Boxscore JSON; pass final=True for finished games so it is cached for good."""
+        return self.get_json(f"/game/{game_pk}/boxscore", ttl=FINAL_BOXSCORE_TTL if final else ttl,
+                             stale_ok=stale_ok)
+
+    def search_people(self, name):
+        return self.get_json("/people/search", {"names": name}, ttl=PEOPLE_SEARCH_TTL)
+
+
+def _endpoint(path):
+    """Low-cardinality label for a request path: /game/123/boxscore -> boxscore."""
+    return path.rstrip("/").rsplit("/", 1)[-1]
+
+def is_final(game):
+    """True once a schedule entry's game is over."""
+    return game.get("status", {}).get("abstractGameState") == "Final"
+
+
+client = StatsApiClient()
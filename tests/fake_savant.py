@@ -0,0 +1,49 @@
+"""A local stand-in for the Savant leaderboard CSV exports."""
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit, parse_qs
+
+from refresh_savant import LEADERBOARDS
+
+
+@contextmanager
+def fixture_server(directory):
+    """Serve `<table>.csv` files from `directory` at the leaderboard URLs; yields the base URL.
+
+    Tables with no file answer 404, and a file named `<table>.status`
+    holding a number answers with that status instead.
+    """
+    directory = Path(directory)
+    routes = {(f"/{path}", params["type"]): table for table, (path, params) in LEADERBOARDS.items()}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlsplit(self.path)
+            table = routes.get((url.path, parse_qs(url.query).get("type", [""])[0]))
+            status_file = directory / f"{table}.status"
+            csv = directory / f"{table}.csv"
+            if table is not None and status_file.exists():
+                self.send_error(int(status_file.read_text().strip()))
+            elif table is None or not csv.exists():
+                self.send_error(404)
+            else:
+                body = csv.read_bytes()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/csv")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
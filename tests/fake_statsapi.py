@@ -0,0 +1,81 @@
+"""A local stand-in for the StatsAPI schedule and boxscore endpoints.
+
+`FakeStatsApi.state` drives the responses: `batting_order` posts the home
+lineup, `away_pitcher` names the away probable and `fail_with` makes
+every request answer with that HTTP status. Responses carry an ETag and
+answer 304 to a matching If-None-Match, like the real API.
+"""
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+GAME_PK = 745001
+
+
+def _side(team_id, batting_order):
+    players = {}
+    for i in range(12):
+        player = {"person": {"id": team_id * 100 + i, "fullName": f"Player {team_id}-{i}"}, "position": {}}
+        if batting_order and i < 9:
+            player["battingOrder"] = str((i + 1) * 100)
+        players[f"ID{team_id * 100 + i}"] = player
+    return {"players": players}
+
+
+class FakeStatsApi:
+    def __init__(self):
+        self.state = {"batting_order": False, "away_pitcher": "Logan Webb", "fail_with": None}
+        self.requests = {}  # status -> count
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                status = fake.state["fail_with"]
+                if status is not None:
+                    fake._hit(status)
+                    self.send_error(status)
+                    return
+                body = json.dumps(fake.schedule() if self.path.startswith("/schedule") else fake.boxscore())
+                etag = '"%s"' % hashlib.md5(body.encode()).hexdigest()
+                if self.headers.get("If-None-Match") == etag:
+                    fake._hit(304)
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                fake._hit(200)
+                self.send_response(200)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Type", "application/json")
+                self.end_headers()
+                self.wfile.write(body.encode())
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def _hit(self, status):
+        self.requests[status] = self.requests.get(status, 0) + 1
+
+    def schedule(self):
+        return {"dates": [{"games": [{
+            "gamePk": GAME_PK,
+            "status": {"abstractGameState": "Preview"},
+            "teams": {
+                "away": {"team": {"name": "New York Yankees"},
+                         "probablePitcher": {"id": 1, "fullName": self.state["away_pitcher"]}},
+                "home": {"team": {"name": "Boston Red Sox"},
+                         "probablePitcher": {"id": 2, "fullName": "Garrett Crochet"}},
+            },
+        }]}]}
+
+    def boxscore(self):
+        return {"teams": {"home": _side(1, self.state["batting_order"]), "away": _side(2, self.state["batting_order"])}}
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
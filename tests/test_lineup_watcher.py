@@ -0,0 +1,100 @@
+import time
+
+import pandas as pd
+import pytest
+
+from fake_statsapi import FakeStatsApi, GAME_PK
+from lineup_watcher import LineupWatcher
+from statsapi import StatsApiClient
+
+
+@pytest.fixture
+def api():
+    fake = FakeStatsApi()
+    yield fake
+    fake.close()
+
+
+@pytest.fixture
+def watcher(api):
+    builds = []
+
+    def build(lineups):
+        builds.append(lineups)
+        return pd.DataFrame({"Game": [label for label, _ in lineups]})
+
+    watcher = LineupWatcher(client=StatsApiClient(base_url=api.url, cache_dir=None), interval=0.05,
+                            max_interval=0.4, build=build)
+    watcher.builds = builds
+    yield watcher
+    watcher.stop()
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_change_detection(api, watcher):
+    first = watcher.poll_once()
+    assert [(u.game_pk, u.label, u.reason, u.confirmed) for u in first] == [(GAME_PK, "NYY @ BOS", "new", False)]
+
+    # nothing changed: every request revalidates to a 304 and nothing is rebuilt
+    assert watcher.poll_once() == []
+    assert api.requests[304] == 2
+    assert len(watcher.builds) == 1
+
+    api.state["batting_order"] = True
+    (update,) = watcher.poll_once()
+    assert (update.reason, update.confirmed) == ("batting order", True)
+    assert update.batters[0] == "Player 1-0"
+
+    api.state["away_pitcher"] = "Carlos Rodon"
+    (update,) = watcher.poll_once()
+    assert update.reason == "probable pitcher"
+    assert update.pitchers == ["Carlos Rodon", "Garrett Crochet"]
+    assert len(watcher.builds) == 3
+
+
+def test_every_reader_sees_every_update(api, watcher):
+    watcher.poll_once()
+    api.state["batting_order"] = True
+    watcher.poll_once()
+    first, seq = watcher.updates_since(0)
+    second, _ = watcher.updates_since(0)
+    assert [u.reason for u in first] == [u.reason for u in second] == ["new", "batting order"]
+    assert watcher.updates_since(seq) == ([], seq)
+
+
+def test_outage_raises_instead_of_replaying_the_cache(api, watcher):
+    watcher.poll_once()
+    api.state["fail_with"] = 500
+    with pytest.raises(Exception):
+        watcher.poll_once()
+
+
+def test_backoff_doubles_and_resets(api, watcher):
+    watcher.poll_once()  # warm the client cache
+    api.state["fail_with"] = 500
+    watcher.start()
+    assert wait_for(lambda: watcher.errors >= 3)
+    assert watcher.wait > watcher.interval
+    assert wait_for(lambda: watcher.wait == watcher.max_interval)
+
+    api.state["fail_with"] = None
+    assert wait_for(lambda: watcher.errors == 0, timeout=2.0)
+    assert watcher.wait == watcher.interval
+
+
+def test_idle_watcher_stops(api):
+    watcher = LineupWatcher(client=StatsApiClient(base_url=api.url, cache_dir=None), interval=0.05,
+                            build=lambda lineups: pd.DataFrame(), idle_timeout=0.2)
+    watcher.start()
+    assert wait_for(lambda: not watcher.running, timeout=2.0)
+    watcher.start()
+    assert watcher.running
+    watcher.stop()
@@ -0,0 +1,56 @@
+import json
+from pathlib import Path
+
+import pytest
+
+import pipeline
+import weather
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+
+@pytest.fixture
+def saved_weather(monkeypatch):
+    table = weather.parse_weather((FIXTURES / "rotogrinders_weather.html").read_text())
+    monkeypatch.setattr(weather, "get_weather", lambda *args, **kwargs: table)
+    return table
+
+
+def test_weather_for_uses_the_home_park(saved_weather):
+    # Wrigley comes first on the page, but the game is at Coors
+    assert pipeline.weather_for("CHC", "COL")["location"] == "coors field"
+    assert pipeline.weather_for("COL", "NYY") is None
+
+
+def test_weather_for_is_valid_json(saved_weather):
+    row = pipeline.weather_for("NYY", "TBR")
+    assert row["dome"] is True and row["temp"] is None
+    json.dumps(row, allow_nan=False)
+
+
+def test_cached_features_builds_once_per_fingerprint():
+    pipeline.clear_features()
+    builds = []
+    build = lambda: builds.append(1) or len(builds)
+    assert pipeline.cached_features(("test", 1), "a", build) == 1
+    assert pipeline.cached_features(("test", 1), "a", build) == 1
+    assert pipeline.cached_features(("test", 1), "b", build) == 2
+    assert pipeline.cached_features(("test", 1), "b", build, refresh=True) == 3
+
+
+def test_partial_results_expire(monkeypatch):
+    pipeline.clear_features()
+    now = [1000.0]
+    monkeypatch.setattr(pipeline.time, "time", lambda: now[0])
+    results = [pipeline.RecentForm({}, None, ["Player A"]), pipeline.RecentForm({}, None, [])]
+    build = lambda: results.pop(0)
+    ttl = lambda recent: pipeline.PARTIAL_TTL if recent.failed else None
+
+    assert pipeline.cached_features(("recent", 1), "a", build, ttl=ttl).failed == ["Player A"]
+    now[0] += pipeline.PARTIAL_TTL - 1
+    assert pipeline.cached_features(("recent", 1), "a", build, ttl=ttl).failed == ["Player A"]
+    now[0] += 2
+    assert pipeline.cached_features(("recent", 1), "a", build, ttl=ttl).failed == []
+    # a complete result is kept
+    now[0] += 10 * pipeline.PARTIAL_TTL
+    assert pipeline.cached_features(("recent", 1), "a", build, ttl=ttl).failed == []
@@ -0,0 +1,90 @@
+import threading
+import time
+
+import pandas as pd
+
+from player_ids import IdCache
+from recent_form import fetch_statcast_frames
+
+IDS = {"Aaron Judge": 592450, "Juan Soto": 665742, "Nobody": None}
+
+
+def resolve(name):
+    return IDS[name]
+
+
+def fetch_all(names, fetch, **kwargs):
+    kwargs = {"resolve": resolve, "backoff": 0, **kwargs}
+    return {result.name: result for result in fetch_statcast_frames(names, "2025-06-01", "2025-06-11",
+                                                                      fetch=fetch, **kwargs)}
+
+
+def test_failed_attempts_are_retried():
+    calls = []
+
+    def flaky(start_dt, end_dt, player_id):
+        calls.append(player_id)
+        if len(calls) < 3:
+            raise ConnectionError("reset")
+        return pd.DataFrame({"batter": [player_id]})
+
+    results = fetch_all(["Aaron Judge"], flaky, retries=2)
+
+    assert calls == [592450] * 3
+    assert results["Aaron Judge"].error is None
+    assert results["Aaron Judge"].frame["batter"].tolist() == [592450]
+
+
+def test_one_failure_does_not_sink_the_rest():
+    def fetch(start_dt, end_dt, player_id):
+        if player_id == 665742:
+            raise ConnectionError("reset")
+        return pd.DataFrame({"batter": [player_id]})
+
+    results = fetch_all(["Aaron Judge", "Juan Soto", "Nobody"], fetch, retries=1)
+
+    assert results["Aaron Judge"].frame is not None
+    assert isinstance(results["Juan Soto"].error, ConnectionError)
+    assert results["Nobody"] == ("Nobody", None, None, None)  # unresolved: no fetch, no error
+
+
+def test_slow_player_times_out_and_is_not_retried():
+    release = threading.Event()
+    calls = []
+
+    def fetch(start_dt, end_dt, player_id):
+        calls.append(player_id)
+        if player_id == 665742:
+            release.wait(5)
+            raise ConnectionError("gave up")
+        return pd.DataFrame({"batter": [player_id]})
+
+    start = time.monotonic()
+    results = fetch_all(["Aaron Judge", "Juan Soto"], fetch, timeout=0.1, retries=3)
+
+    assert time.monotonic() - start < 2
+    assert isinstance(results["Juan Soto"].error, TimeoutError)
+    assert results["Aaron Judge"].frame is not None
+    release.set()
+    time.sleep(0.2)
+    assert calls.count(665742) == 1
+
+
+def test_worker_outliving_the_batch_still_saves_its_id(tmp_path):
+    cache = IdCache(tmp_path / "ids.sqlite")
+    release = threading.Event()
+
+    def slow_resolve(name):
+        release.wait(5)
+        cache.put(name, 665742)
+        return 665742
+
+    with cache.batch():
+        results = fetch_all(["Juan Soto"], lambda *args: pd.DataFrame(), resolve=slow_resolve, timeout=0.1)
+    assert isinstance(results["Juan Soto"].error, TimeoutError)
+
+    release.set()
+    deadline = time.monotonic() + 5
+    while cache.get("Juan Soto") != (True, 665742) and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert cache.get("Juan Soto") == (True, 665742)
@@ -0,0 +1,83 @@
+import shutil
+
+import pandas as pd
+import pytest
+
+import data_store
+import refresh_savant
+from fake_savant import fixture_server
+
+TABLE = "exit_batters"
+CSV = data_store.TABLES[TABLE][0]
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """A copy of the checked-in exit_batters CSV, standing in for the repo's data directory."""
+    directory = tmp_path / "data"
+    directory.mkdir()
+    shutil.copy(data_store.DATA_DIR / CSV, directory / CSV)
+    monkeypatch.setattr(data_store, "DATA_DIR", directory)
+    return directory
+
+
+@pytest.fixture
+def served(tmp_path):
+    directory = tmp_path / "served"
+    directory.mkdir()
+    return directory
+
+
+def refresh(base_url):
+    [result] = refresh_savant.refresh(2025, [TABLE], base_url=base_url, max_workers=1, timeout=5)
+    return result
+
+
+def test_changed_table_is_swapped_in_place(data_dir, served):
+    frame = pd.read_csv(data_dir / CSV)
+    frame.loc[0, "avg_hit_speed"] += 1.5
+    frame.to_csv(served / f"{TABLE}.csv", index=False)
+
+    with fixture_server(served) as url:
+        result = refresh(url)
+
+    assert result.status == "updated"
+    assert result.detail == "+0 -0 ~1 players"
+    assert (data_dir / CSV).read_bytes() == (served / f"{TABLE}.csv").read_bytes()
+    assert [path.name for path in data_dir.iterdir()] == [CSV]  # no temp file left behind
+
+
+def test_identical_table_is_left_alone(data_dir, served):
+    shutil.copy(data_dir / CSV, served / f"{TABLE}.csv")
+    mtime = (data_dir / CSV).stat().st_mtime_ns
+
+    with fixture_server(served) as url:
+        result = refresh(url)
+
+    assert result.status == "unchanged"
+    assert (data_dir / CSV).stat().st_mtime_ns == mtime
+
+
+def test_truncated_table_is_rejected(data_dir, served):
+    before = (data_dir / CSV).read_bytes()
+    pd.read_csv(data_dir / CSV).head(refresh_savant.MIN_ROWS - 1).to_csv(served / f"{TABLE}.csv", index=False)
+
+    with fixture_server(served) as url:
+        result = refresh(url)
+
+    assert result.status == "invalid"
+    assert result.detail == f"only {refresh_savant.MIN_ROWS - 1} rows"
+    assert (data_dir / CSV).read_bytes() == before
+
+
+def test_failed_download_keeps_the_old_file(data_dir, served):
+    before = (data_dir / CSV).read_bytes()
+    shutil.copy(data_dir / CSV, served / f"{TABLE}.csv")
+    (served / f"{TABLE}.status").write_text("500")
+
+    with fixture_server(served) as url:
+        result = refresh(url)
+
+    assert result.status == "failed"
+    assert "500" in result.detail
+    assert (data_dir / CSV).read_bytes() == before
@@ -0,0 +1,47 @@
+import asyncio
+import json
+
+import tornado.httpclient
+
+import pipeline
+import server
+
+
+def fetch(path):
+    """(status, JSON body) for one GET against a fresh app on an ephemeral port."""
+    async def main():
+        listener = server.make_app(max_workers=1).listen(0, "127.0.0.1")
+        port = next(iter(listener._sockets.values())).getsockname()[1]
+        try:
+            response = await tornado.httpclient.AsyncHTTPClient().fetch(
+                f"http://127.0.0.1:{port}{path}", raise_error=False)
+        finally:
+            listener.stop()
+        return response.code, json.loads(response.body)
+    return asyncio.run(main())
+
+
+def test_unknown_team_is_400():
+    code, body = fetch("/rank/season?matchup=XXX@BOS")
+    assert code == 400
+    assert "unknown team 'XXX'" in body["error"]
+
+
+def test_bad_scoring_parameters_are_400():
+    assert fetch("/rank/season?matchup=NYY@BOS&stats=Nope&weights=1")[0] == 400
+    assert fetch("/rank/season?matchup=NYY@BOS&stats=EV,Barrel%20%25&weights=1")[0] == 400
+    assert fetch("/rank/season?matchup=NYY@BOS&weights=a,b")[0] == 400
+    assert fetch("/rank/recent?matchup=NYY@BOS&window=4")[0] == 400
+    assert fetch("/rank/slate?date=tomorrow")[0] == 400
+
+
+def test_pipeline_errors_are_logged_500s(monkeypatch, caplog):
+    def broken(*args):
+        raise KeyError("Name")
+    monkeypatch.setattr(pipeline, "season_features", broken)
+
+    code, body = fetch("/rank/season?matchup=NYY@BOS")
+
+    assert code == 500
+    assert body == {"error": "Internal Server Error"}
+    assert any(record.exc_info and record.exc_info[0] is KeyError for record in caplog.records)
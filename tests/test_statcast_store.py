@@ -0,0 +1,60 @@
+import threading
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+
+import statcast_store
+
+THROUGH = date(2025, 6, 30)
+
+
+@pytest.fixture(autouse=True)
+def store_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(statcast_store, "STORE_DIR", tmp_path / "store")
+    return tmp_path / "store"
+
+
+def pitches(start_dt, end_dt):
+    days = pd.date_range(start_dt, end_dt)
+    return pd.DataFrame({"game_date": days, "batter": 1, "launch_speed": 95.0, "type": "X"})
+
+
+def test_update_fills_and_covers_the_span():
+    written = statcast_store.update(through=THROUGH, days=5, fetch=pitches)
+    assert written == [THROUGH - timedelta(days=i) for i in range(4, -1, -1)]
+    assert statcast_store.covers(THROUGH - timedelta(days=4), THROUGH)
+    assert not statcast_store.covers(THROUGH - timedelta(days=5), THROUGH)
+    assert len(statcast_store.load(THROUGH - timedelta(days=4), THROUGH)) == 5
+
+
+def test_update_only_fetches_missing_days():
+    statcast_store.update(through=THROUGH - timedelta(days=1), days=5, fetch=pitches)
+    calls = []
+    statcast_store.update(through=THROUGH, days=5, fetch=lambda s, e: calls.append((s, e)) or pitches(s, e))
+    assert calls == [(THROUGH.isoformat(), THROUGH.isoformat())]
+
+
+def test_no_temp_files_left_behind(store_dir):
+    statcast_store.update(through=THROUGH, days=3, fetch=pitches)
+    assert not list(store_dir.glob("*.tmp"))
+
+
+def test_non_blocking_update_skips_while_another_writer_holds_the_lock():
+    held, release = threading.Event(), threading.Event()
+
+    def writer():
+        with statcast_store._update_lock():
+            held.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    held.wait(5)
+    try:
+        assert statcast_store.update(through=THROUGH, days=3, fetch=pitches, blocking=False) is None
+    finally:
+        release.set()
+        thread.join()
+    assert statcast_store.update(through=THROUGH, days=3, fetch=pitches, blocking=False) == [
+        THROUGH - timedelta(days=2), THROUGH - timedelta(days=1), THROUGH]
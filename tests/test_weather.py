@@ -0,0 +1,78 @@
+import math
+from pathlib import Path
+
+import pytest
+
+import weather
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+
+@pytest.fixture(scope="module")
+def table():
+    return weather.parse_weather((FIXTURES / "rotogrinders_weather.html").read_text())
+
+
+def test_one_row_per_stadium(table):
+    assert list(table.columns) == weather.COLUMNS
+    assert list(table.index) == ["wrigley field", "coors field", "tropicana field", "fenway park"]
+
+
+def test_open_air_block(table):
+    row = table.loc["wrigley field"]
+    assert row["team"] == "CHC"
+    assert not row["dome"]
+    assert row["temp"] == 78.0
+    assert row["precip"] == 20.0
+    assert row["wind_dir"] == "Out to RF"
+    assert row["wind_speed"] == 12.0
+    assert row["wind_angle"] == 135.0
+
+
+def test_negative_rotation_wraps(table):
+    row = table.loc["coors field"]
+    assert row["temp"] == 64.5
+    assert row["wind_speed"] == 7.0
+    assert row["wind_angle"] == 315.0
+
+
+def test_dome_block(table):
+    row = table.loc["tropicana field"]
+    assert row["team"] == "TBR"
+    assert row["dome"]
+    assert row["wind_dir"] == ""
+    for column in ("temp", "precip", "wind_speed", "wind_angle"):
+        assert math.isnan(row[column])
+
+
+def test_missing_rotate_style_is_zero(table):
+    row = table.loc["fenway park"]
+    assert not row["dome"]
+    assert row["wind_dir"] == "Calm"
+    assert row["wind_speed"] == 0.0
+    assert row["wind_angle"] == 0.0
+
+
+def test_empty_page():
+    table = weather.parse_weather("<html><body></body></html>")
+    assert table.empty
+    assert list(table.columns) == weather.COLUMNS
+
+
+@pytest.mark.parametrize("location, team", [
+    ("wrigley field", "CHC"),
+    ("oriole park at camden yards", "BAL"),  # keyword inside the location
+    ("citi", "NYM"),  # location inside the keyword
+    ("some minor league park", None),
+    ("", None),
+    (None, None),
+])
+def test_team_for_location(location, team):
+    assert weather.team_for_location(location) == team
+
+
+def test_stadium_weather_is_the_home_park(table):
+    # both teams have a park on the page; only the home team's counts
+    assert weather.stadium_weather(table, "CHC")["location"] == "wrigley field"
+    assert weather.stadium_weather(table, "COL")["location"] == "coors field"
+    assert weather.stadium_weather(table, "NYY") is None
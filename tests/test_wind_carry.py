@@ -0,0 +1,84 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import weather
+from scrape_stats import wind_carry
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+SIDES = ["R", "L", "S"]
+
+
+def park(wind_dir, speed=10.0, team="COL", dome=False):
+    row = dict(location="coors field", team=team, dome=dome, temp=70.0, precip=0.0,
+               wind_dir=wind_dir, wind_speed=speed, wind_angle=0.0)
+    return pd.DataFrame([row], columns=weather.COLUMNS)
+
+
+def pull_carry(wind_dir, speed=10.0):
+    """Carry for an all-pull R, L and S hitter at one park."""
+    return wind_carry(["COL"] * 3, park(wind_dir, speed), SIDES, [1.0] * 3, [0.0] * 3)
+
+
+@pytest.mark.parametrize("wind_dir, expected", [
+    ("Out to CF", 0.0), ("Out to LF", -45.0), ("Out to RF", 45.0),
+    ("In from CF", 180.0), ("In from LF", 135.0), ("In from RF", -135.0),
+    ("L to R", 90.0), ("R to L", -90.0),
+])
+def test_field_direction(wind_dir, expected):
+    assert weather.field_direction(wind_dir) == expected
+
+
+@pytest.mark.parametrize("wind_dir", ["Calm", "", None, "Variable"])
+def test_field_direction_unknown(wind_dir):
+    assert np.isnan(weather.field_direction(wind_dir))
+
+
+def test_out_to_center_carries_everyone():
+    assert (pull_carry("Out to CF") > 0).all()
+
+
+def test_in_from_center_knocks_everyone_down():
+    assert (pull_carry("In from CF") < 0).all()
+
+
+def test_out_to_a_field_favours_hitters_who_pull_there():
+    right, left, switch = pull_carry("Out to LF")
+    assert right == pytest.approx(10.0)  # straight out over a righty's pull field
+    assert left == pytest.approx(0.0, abs=1e-9)
+    assert switch > 0
+
+
+def test_in_from_a_field_hurts_hitters_who_pull_there():
+    right, left, _ = pull_carry("In from LF")
+    assert right < 0
+    assert left == pytest.approx(0.0, abs=1e-9)
+
+
+def test_cross_wind_helps_one_side_and_hurts_the_other():
+    right, left, switch = pull_carry("L to R")
+    assert right < 0 < left
+    assert switch == pytest.approx(0.0, abs=1e-9)
+    right, left, _ = pull_carry("R to L")
+    assert left < 0 < right
+
+
+def test_dome_calm_missing_and_unreadable():
+    assert (wind_carry(["COL"], park("Out to CF", dome=True), ["R"], [1.0], [1.0]) == 0).all()
+    assert (wind_carry(["COL"], park("Calm", speed=0.0), ["R"], [1.0], [1.0]) == 0).all()
+    assert np.isnan(wind_carry(["NYY"], park("Out to CF"), ["R"], [1.0], [1.0])).all()
+    assert np.isnan(wind_carry(["COL"], park("Swirling"), ["R"], [1.0], [1.0])).all()
+
+
+def test_saved_page_signs():
+    table = weather.parse_weather((FIXTURES / "rotogrinders_weather.html").read_text())
+    # Coors, "In from LF" at 7 mph: a right-handed pull hitter loses carry
+    coors = wind_carry(["COL"], table, ["R"], [1.0], [0.0])
+    assert coors[0] == pytest.approx(-7.0)
+    # Wrigley, "Out to RF": a righty's opposite-field fly balls carry
+    wrigley = wind_carry(["CHC"], table, ["R"], [0.0], [1.0])
+    assert wrigley[0] == pytest.approx(12.0)
+    # Fenway, "Calm" at 0 mph
+    assert wind_carry(["BOS"], table, ["R"], [1.0], [1.0])[0] == 0.0
@@ -0,0 +1,191 @@
+"""Game-time weather for every stadium, parsed once per TTL.
+
+The RotoGrinders weather page is fetched at most once every WEATHER_TTL
+seconds per process and all stadium blocks are parsed in a single
+SoupStrainer-restricted pass (lxml when installed). The result is one
+table keyed by stadium, so switching matchups never refetches or
+re-parses anything. Rotated wind arrows are memoized per whole degree.
+
+Usage: python3 weather.py [saved_page.html]
+"""
+import re
+import sys
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+
+import pandas as pd
+import requests
+
+from instrumentation import count, timed
+
+WEATHER_URL = "https://rotogrinders.com/weather/mlb"
+WEATHER_TTL = 15 * 60  # seconds
+TIMEOUT = (3.05, 10)
+ARROW_PATH = Path(__file__).resolve().parent / "arrow.png"
+
+STADIUM_KEYWORDS = {
+    "ARI": "chase field", "ATL": "truist park", "BAL": "camden yards",
+    "BOS": "fenway park", "CHC": "wrigley field", "CHW": "guaranteed rate field",
+    "CIN": "great american ball park", "CLE": "progressive field", "COL": "coors field",
+    "DET": "comerica park", "HOU": "minute maid park", "KCR": "kauffman stadium",
+    "LAA": "angel stadium", "LAD": "dodger stadium", "MIA": "loandepot park",
+    "MIL": "american family field", "MIN": "target field", "NYM": "citi field",
+    "NYY": "yankee stadium", "OAK": "sutter health park", "PHI": "citizens bank park",
+    "PIT": "pnc park", "SDP": "petco park", "SEA": "t-mobile park", "SFG": "oracle park",
+    "STL": "busch stadium", "TBR": "tropicana field", "TEX": "globe life field",
+    "TOR": "rogers centre", "WSH": "nationals park"
+}
+
+# one row per stadium; numbers are NaN for domes. wind_angle is the icon's
+# rotation, for display only: the field-relative direction is in wind_dir
+COLUMNS = ["location", "team", "dome", "temp", "precip", "wind_dir", "wind_speed", "wind_angle"]
+
+# field -> degrees clockwise from straight out to center field
+FIELD_ANGLES = {"lf": -45.0, "left": -45.0, "cf": 0.0, "center": 0.0, "rf": 45.0, "right": 45.0}
+
+_ROTATE = re.compile(r"rotate\((-?[\d.]+)deg\)")
+_WIND_OUT = re.compile(r"\bout to (lf|cf|rf|left|center|right)\b")
+_WIND_IN = re.compile(r"\bin from (lf|cf|rf|left|center|right)\b")
+_WIND_ACROSS = re.compile(r"\b(l|r|left|right) to (l|r|left|right)\b")
+_NUMBER = re.compile(r"-?\d+(?:\.\d+)?")
+
+_lock = threading.Lock()
+_cache = {}  # "table" -> (fetched_at, frame)
+
+
+def _parser():
+    try:
+        import lxml  # noqa: F401
+        return "lxml"
+    except ImportError:
+        return "html.parser"
+
+def _number(text):
+    match = _NUMBER.search(text or "")
+    return float(match.group()) if match else float("nan")
+
+def _value(span):
+    return span.find("span", class_="weather-gametime-value bold").get_text()
+
+def team_for_location(location):
+    """Home team abbreviation for a RotoGrinders stadium name, or None."""
+    if not location:
+        return None
+    for team, keyword in STADIUM_KEYWORDS.items():
+        if keyword in location or location in keyword:
+            return team
+    return None
+
+def field_direction(wind_dir):
+    """Degrees clockwise from straight out to center field that a wind_dir blows toward, or NaN.
+
+    "Out to CF" is 0, "Out to RF" 45, "L to R" 90, "In from CF" 180 and
+    "In from RF" -135. Calm or unrecognized text is NaN.
+    """
+    text = (wind_dir or "").lower()
+    out, into, across = _WIND_OUT.search(text), _WIND_IN.search(text), _WIND_ACROSS.search(text)
+    if out:
+        return FIELD_ANGLES[out.group(1)]
+    if into:
+        return 180.0 - (180.0 - (FIELD_ANGLES[into.group(1)] + 180.0)) % 360.0
+    if across and across.group(1)[0] != across.group(2)[0]:
+        return 90.0 if across.group(1)[0] == "l" else -90.0
+    return float("nan")
+
+def _parse_block(block):
+    location_div = block.find("span", class_="game-weather-stadium")
+    if not location_div:
+        return None
+    location = location_div.get_text()[2:].strip().lower()
+    row = dict.fromkeys(COLUMNS, float("nan"))
+    row.update(location=location, team=team_for_location(location), dome=True, wind_dir="")
+
+    weather_data = block.find_all("div", class_="weather-gametime-set")
+    if len(weather_data) == 0:
+        return row
+
+    conditions = weather_data[0].find_all("span", recursive=False)
+    wind = weather_data[1].find_all("span", recursive=False)
+    # the third <path> of the wind icon carries the arrow's rotation
+    path = block.find_all("span", class_="weather-gametime-icon")[-1].find("svg").find_all("path")[2]
+    rotation = _ROTATE.search(path.get("style") or "")
+    row.update(
+        dome=False,
+        temp=_number(_value(conditions[-2])),
+        precip=_number(_value(conditions[-1])),
+        wind_dir=_value(wind[-2]).strip(),
+        wind_speed=_number(_value(wind[-1])),
+        wind_angle=float(rotation.group(1)) % 360 if rotation else 0.0,
+    )
+    return row
+
+def parse_weather(html):
+    """Parse every stadium block of a RotoGrinders weather page into one table indexed by location."""
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    soup = BeautifulSoup(html, _parser(), parse_only=SoupStrainer("div", class_="module"))
+    rows = [row for row in map(_parse_block, soup.find_all("div", class_="module")) if row is not None]
+    table = pd.DataFrame(rows, columns=COLUMNS).drop_duplicates("location")
+    return table.set_index("location", drop=False)
+
+def fetch_weather(session=None):
+    with timed("http_request", endpoint="weather"):
+        response = (session or requests).get(WEATHER_URL, headers={"User-Agent": "Mozilla/5.0"}, timeout=TIMEOUT)
+    count("http_requests", endpoint="weather", status=response.status_code)
+    count("http_bytes", len(response.content or b""), endpoint="weather")
+    response.raise_for_status()
+    with timed("weather_parse"):
+        return parse_weather(response.text)
+
+def get_weather(ttl=WEATHER_TTL):
+    """The parsed weather table, refetched at most once per `ttl` seconds (stale copy on error)."""
+    with _lock:
+        entry = _cache.get("table")
+        if entry is not None and time.time() - entry[0] < ttl:
+            return entry[1]
+        try:
+            table = fetch_weather()
+        except Exception:
+            if entry is not None:
+                return entry[1]
+            raise
+        _cache["table"] = (time.time(), table)
+        return table
+
+def weather_or_empty():
+    """get_weather(), or an empty table when the page can't be fetched (wind features become NaN)."""
+    try:
+        return get_weather()
+    except Exception:
+        return pd.DataFrame(columns=COLUMNS)
+
+def stadium_weather(table, home_team):
+    """The row of `table` for the home team's park (or None)."""
+    match = table[table["team"] == home_team]
+    return None if match.empty else match.iloc[0]
+
+
+@lru_cache(maxsize=1)
+def _arrow():
+    from PIL import Image
+    with Image.open(ARROW_PATH) as img:
+        img.load()
+        return img
+
+@lru_cache(maxsize=360)
+def _rotated(degrees):
+    return _arrow().rotate(360 - degrees, expand=True)
+
+def rotated_arrow(angle):
+    """arrow.png turned to point along a RotoGrinders wind angle, memoized per whole degree."""
+    return _rotated(round(angle) % 360)
+
+
+if __name__ == "__main__":
+    html = Path(sys.argv[1]).read_text() if len(sys.argv) > 1 else None
+    start = time.perf_counter()
+    table = parse_weather(html) if html is not None else get_weather()
+    print(table.drop(columns="location").to_string())
+    print(f"\n{len(table)} stadium(s) in {(time.perf_counter() - start) * 1000:.0f} ms")